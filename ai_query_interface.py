@@ -96,7 +96,9 @@ def _build_llm_configuration() -> tuple[Any, LLMRequestContext]:
         )
 
         if request_extra_options:
-            request_context.extra_options.update(request_extra_options)
+            request_context = request_context.model_copy(
+                update={"extra_options": {**request_context.extra_options, **request_extra_options}}
+            )
 
         return client, request_context
 
@@ -594,8 +596,7 @@ class AIQuery:
                 request_context=self._request_context,
                 system_prompt=system_prompt,
             )
-            payload = json.loads(strip_json_code_fence(raw))
-            evaluation = QuestionEvaluation.parse_obj(payload)
+            evaluation = QuestionEvaluation.model_validate_json(strip_json_code_fence(raw))
         except Exception:
             if required:
                 return QuestionEvaluation(question=key, ask_again=True)
@@ -735,8 +736,7 @@ class AIQuery:
         should_ask_again = False
         if raw:
             try:
-                payload = json.loads(strip_json_code_fence(raw))
-                llm_response = ProfileUpdateResponse.parse_obj(payload)
+                llm_response = ProfileUpdateResponse.model_validate_json(strip_json_code_fence(raw))
                 updates = llm_response.updates
                 should_ask_again = llm_response.should_ask_again
             except Exception:
@@ -1,13 +1,15 @@
 # main_app.py
-import asyncio
 import json
+import os
+import re
 import uuid
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Any, Dict, List
 
+import orjson
 from flask import Flask, request, session, redirect, url_for, jsonify, render_template
-from flask_cors import CORS, cross_origin
+from flask_cors import CORS
 
 # Your existing modules (unchanged)
 import ai_query_interface
@@ -17,162 +19,7 @@ from src.llm_module.models import HealthInfo
 from src.llm_module.workflow import ensure_user_health_profile
 
 
-class App:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("AI Chat")
-
-        self.loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self.loop)
-
-        self.query = None
-        self.model = PredictionModel()
-        self.ai_busy = False
-
-        self.login_frame = tk.Frame(self.root)
-        self.chat_frame = tk.Frame(self.root)
-
-        self.user_id_var = tk.StringVar()
-
-        self._build_login_ui()
-
-        self.login_frame.pack(fill="both", expand=True)
-        self._poll_asyncio()
-
-    def _poll_asyncio(self):
-        try:
-            self.loop.stop()
-            self.loop.run_forever()
-        except RuntimeError:
-            pass
-        self.root.after(10, self._poll_asyncio)
-
-    def _build_login_ui(self):
-        tk.Label(self.login_frame, text="User ID:").pack(pady=10)
-        tk.Entry(self.login_frame, textvariable=self.user_id_var).pack(pady=5)
-        tk.Button(self.login_frame, text="Login", command=self._on_login).pack(pady=10)
-
-    def _build_chat_ui(self):
-        self.chat_log = scrolledtext.ScrolledText(self.chat_frame, state="disabled", wrap="word", height=20)
-        self.chat_log.pack(fill="both", expand=True, padx=5, pady=5)
-
-        self.user_input = tk.Text(self.chat_frame, height=1, wrap="word")
-        self.user_input.pack(fill="x", padx=5, pady=5)
-        self.user_input.bind("<KeyRelease>", self._auto_resize_input)
-        self.user_input.bind("<Return>", self._on_enter)
-        self.user_input.bind("<Shift-Return>", lambda e: None)
-
-        self.send_button = tk.Button(self.chat_frame, text="Send", command=self._on_send)
-        self.send_button.pack(pady=5)
-
-    def _disable_send(self):
-        self.ai_busy = True
-        self.send_button.config(state="disabled")
-        self.root.title("AI is typing...")
-
-    def _enable_send(self):
-        self.ai_busy = False
-        self.send_button.config(state="normal")
-        self.root.title("AI Chat")
-
-    def _auto_resize_input(self, event=None):
-        content = self.user_input.get("1.0", "end-1c")
-        lines = content.count("\n") + 1
-        lines = max(1, min(lines, 8))
-        self.user_input.configure(height=lines)
-
-    def _append_log(self, text: str):
-        self.chat_log.config(state="normal")
-        self.chat_log.insert("end", text + "\n")
-        self.chat_log.config(state="disabled")
-        self.chat_log.see("end")
-
-    def _on_login(self):
-        user_id = self.user_id_var.get().strip()
-        if not user_id.isdigit():
-            return
-        self.query = AIQuery(int(user_id))
-        
-        self._build_chat_ui()
-        self.login_frame.pack_forget()
-        self.chat_frame.pack(fill="both", expand=True)
-        self._append_log("System: Logged in")
-
-        self._disable_send()  # disable immediately
-        self.loop.create_task(self._run_greeting())
-
-    async def _run_greeting(self):
-        greeting = await self.query.Greeting()
-        self._append_log(f"AI: {greeting}")
-        await self._drain_pending_ai_messages()
-        self._enable_send()
-
-    async def _drain_pending_ai_messages(self):
-        if self.query is None:
-            return
-        while True:
-            body = await self.query.QueryBody()
-            if not body:
-                break
-            self._append_log(f"AI: {body}")
-            if not self.query or not getattr(self.query, "_message_queue", None):
-                break
-
-    def _on_enter(self, event):
-        if self.ai_busy:
-            return "break"
-        self._on_send()
-        return "break"
-
-    def _on_send(self):
-        if self.ai_busy:
-            return
-        msg = self.user_input.get("1.0", "end").strip()
-        if not msg:
-            return
-        self.user_input.delete("1.0", "end")
-        self._auto_resize_input()
-        self._append_log(f"You: {msg}")
-        self._disable_send()
-        self.loop.create_task(self._handle_user_input(msg))
-
-    async def _handle_user_input(self, msg: str):
-        keep = await self.query.ContinueQuery(msg)
-        if not keep:
-            await self._finish_query()
-            return
-        body = await self.query.QueryBody()
-        self._append_log(f"AI: {body}")
-        if self.query and getattr(self.query, "_message_queue", None):
-            await self._drain_pending_ai_messages()
-        self._enable_send()
-
-    async def _finish_query(self):
-        closing = await self.query.Closing()
-        self._append_log(f"AI: {closing}")
-
-        payload = await self.query.RequestResult()
-        result, png_path, b_safe = await self.model.predict(payload)
-        conclusion = await self.query.Conclusion(result, b_safe)
-        self._append_log(f"AI: {conclusion}")
-
-        # destroy query and lock UI
-        if b_safe:
-            self.query = None
-            self.ai_busy = True
-            self.send_button.config(state="disabled")
-            self.user_input.config(state="disabled")
-            self.root.title("Session finished")
-        else:
-            self.query = None
-            self.ai_busy = True
-            self.send_button.config(state="disabled")
-            self.user_input.config(state="disabled")
-            self.root.title("Session finished")
-
-    def run(self):
-        self.root.mainloop()
-@dataclass
+@dataclass(slots=True)
 class SessionState:
     query: Optional[AIQuery]
     model: PredictionModel
@@ -181,6 +28,8 @@ class SessionState:
 
 
 _sessions: Dict[str, SessionState] = {}
+# ASCII digits only: str.isdigit() also accepts Unicode digits such as '٠'.
+_USERID_RE = re.compile(r"[0-9]{1,10}")
 USER_DATA_DIR = Path(ai_query_interface.__file__).resolve().parent / "user_data"
 UNDERLYING_DISEASE_CHOICES = {
     "Type 1 Diabetes",
@@ -238,12 +87,14 @@ frontend_origins = [
     "http://127.0.0.1:3000"
 ]
 
-CORS(
-    app,
-    resources={r"/api/*": {"origins": list(frontend_origins)}},
-    supports_credentials=True,
-)
-
+# Cross-origin access for the hosted Next.js frontend; set AIGLUCOSE_CORS=0 when
+# the UI is served from this origin.
+if os.environ.get("AIGLUCOSE_CORS", "1") != "0":
+    CORS(
+        app,
+        resources={r"/api/*": {"origins": list(frontend_origins)}},
+        supports_credentials=True,
+    )
 
 @app.get("/")
 def login_page():
@@ -252,12 +103,11 @@ def login_page():
 
 
 @app.post("/api/login")
-@cross_origin(origins=list(frontend_origins), supports_credentials=True)
 def api_login():
     data = request.get_json(silent=True) or {}
     app.logger.info("Login payload: %r", data)
     user_id = str(data.get("user_id", "")).strip()
-    if not user_id.isdigit():
+    if not _USERID_RE.fullmatch(user_id):
         return jsonify({"ok": False, "error": "User ID must be numeric."}), 400
 
     st = _get_state(create_if_missing=True)
@@ -283,8 +133,7 @@ def chat_page():
 
 
 @app.post("/api/greet")
-@cross_origin(origins=list(frontend_origins), supports_credentials=True)
-def api_greet():
+async def api_greet():
     st = _get_state(create_if_missing=False)
     if not st:
         return jsonify({"messages": [{"type": "system", "text": "No session."}]}), 400
@@ -300,16 +149,15 @@ def api_greet():
         except Exception as exc:
             return jsonify({"messages": [{"type": "system", "role": "System", "text": f"Failed to start session: {exc}"}]}), 500
 
-    greeting = asyncio.run(st.query.Greeting())
+    greeting = await st.query.Greeting()
     msgs.append({"type": "chat", "role": "AI", "text": greeting})
-    first_prompt = asyncio.run(st.query.QueryBody())
+    first_prompt = await st.query.QueryBody()
     if first_prompt:
         msgs.append({"type": "chat", "role": "AI", "text": first_prompt})
     return jsonify({"messages": msgs})
 
 
 @app.get("/api/profile")
-@cross_origin(origins=list(frontend_origins), supports_credentials=True)
 def api_get_profile():
     st = _get_state(create_if_missing=False)
     if not st or st.user_id is None:
@@ -325,7 +173,6 @@ def api_get_profile():
 
 
 @app.post("/api/profile")
-@cross_origin(origins=list(frontend_origins), supports_credentials=True)
 def api_update_profile():
     st = _get_state(create_if_missing=False)
     if not st or st.user_id is None:
@@ -382,7 +229,6 @@ def api_update_profile():
 
 
 @app.get("/api/session")
-@cross_origin(origins=list(frontend_origins), supports_credentials=True)
 def api_session():
     uid = session.get("user_id")
     if uid is None:
@@ -415,7 +261,6 @@ def _normalise_underlying_disease(value: Optional[str]) -> Optional[str]:
 
 
 @app.post("/api/predict")
-@cross_origin(origins=list(frontend_origins), supports_credentials=True)
 def api_predict():
     st = _get_state(create_if_missing=False)
     if not st or st.user_id is None:
@@ -457,12 +302,12 @@ def api_predict():
     }
 
     try:
-        raw_result = asyncio.run(st.model.predict(payload))
+        raw_result = st.model.predict(payload)
         if isinstance(raw_result, tuple):
             raw_json = raw_result[0]
         else:
             raw_json = raw_result
-        result = json.loads(raw_json)
+        result = orjson.loads(raw_json)
     except ValueError as exc:
         return jsonify({"ok": False, "error": str(exc)}), 400
     except Exception as exc:  # pragma: no cover - safeguard
@@ -478,8 +323,7 @@ def api_predict():
 
 
 @app.post("/api/send")
-@cross_origin(origins=list(frontend_origins), supports_credentials=True)
-def api_send():
+async def api_send():
     st = _get_state(create_if_missing=True)
     # If this worker hasn't seen the conversation yet, recreate the query when possible
     if st and not st.query and st.user_id is not None:
@@ -509,15 +353,15 @@ def api_send():
     messages: List[Dict[str, Any]] = []
 
     try:
-        keep = asyncio.run(st.query.ContinueQuery(msg))
+        keep = await st.query.ContinueQuery(msg)
     except Exception as exc:
         return jsonify({"messages": [{"type": "system", "role": "System", "text": f"Sorry, I couldn't process that: {exc}"}]}), 200
     if not keep:
-        closing = asyncio.run(st.query.Closing())
+        closing = await st.query.Closing()
         messages.append({"type": "chat", "role": "AI", "text": closing})
 
     try:
-        body = asyncio.run(st.query.QueryBody())
+        body = await st.query.QueryBody()
     except Exception as exc:
         body = f"I hit a snag generating the next step: {exc}"
     messages.append({"type": "chat", "role": "AI", "text": body})
@@ -525,7 +369,7 @@ def api_send():
     is_finished = not getattr(st.query, "_active", True)
     if is_finished:
         try:
-            payload = asyncio.run(st.query.RequestResult())
+            payload = await st.query.RequestResult()
         except Exception as exc:
             payload = {"message": f"Pipeline finished but result retrieval failed: {exc}"}
         # Try to run a prediction using profile + any macros returned
@@ -567,9 +411,9 @@ def api_send():
                 "return_plot": True,
                 "return_csv": False,
             }
-            raw_pred = asyncio.run(st.model.predict(pred_payload))
+            raw_pred = await st.model.apredict(pred_payload)
             raw_json = raw_pred[0] if isinstance(raw_pred, tuple) else raw_pred
-            pred = json.loads(raw_json)
+            pred = orjson.loads(raw_json)
             minutes = pred.get("minutes", [])
             glucose = pred.get("absolute_glucose", [])
             peak_val = None
@@ -625,4 +469,5 @@ def _serialize_health_info(info: HealthInfo) -> Dict[str, Any]:
 
 
 if __name__ == "__main__":
+    # Development server only; deploy `app` under a threaded WSGI server (see README).
     app.run(host="0.0.0.0", port=2467, debug=False)
@@ -2,27 +2,42 @@
 from __future__ import annotations
 import os
 import asyncio
-import json
 import io
-import base64
-from typing import Any, Dict, List, Optional, Mapping, Tuple
+import itertools
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Mapping, Tuple
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
+from time import monotonic, perf_counter
 
 import numpy as np
 import pandas as pd
 import joblib
-import matplotlib
+import orjson
+from threadpoolctl import threadpool_limits  # installed with scikit-learn
 
-# Force a headless backend so Cocoa/Tk windows are never created server-side.
-matplotlib.use("Agg", force=True)
+try:  # SIMD base64 for plot/CSV payloads; same API as the stdlib module
+    import pybase64 as _b64
+except ImportError:
+    import base64 as _b64
 
-import matplotlib.pyplot as plt
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+
+# Fitted pipelines by resolved artifact path, shared by every PredictionModel in the process.
+_MODEL_CACHE: Dict[Path, Any] = {}
 
 
 # ----------------------------- helpers -----------------------------
-def _bucket_meal_type(x: object) -> str:
-    s = (str(x) if x is not None else "").strip().lower()
+# The input space is a handful of spellings per value, so both normalizers are
+# memoized; lru_cache never caches the ValueError, so bad input keeps raising.
+@lru_cache(maxsize=64)
+def _bucket_meal_type(x: str) -> str:
+    s = x.strip().lower()
     if "breakfast" in s: return "Breakfast"
     if "lunch" in s: return "Lunch"
     if "dinner" in s or "supper" in s: return "Dinner"
@@ -30,57 +45,276 @@ def _bucket_meal_type(x: object) -> str:
     raise ValueError("meal_bucket must be one of: Breakfast, Lunch, Dinner, Snacks")
 
 
-def _normalize_gender(x: Optional[str]) -> str:
+@lru_cache(maxsize=64)
+def _normalize_gender(x: str) -> str:
     s = (x or "Unknown").strip().title()
     return s if s else "Unknown"
 
 
-def _build_plot_base64(minutes: np.ndarray, abs_curve: np.ndarray, delta_curve: np.ndarray) -> str:
-    """Return a base64-encoded PNG of absolute and delta curves."""
-    fig, ax1 = plt.subplots(figsize=(8, 4.5))
-    ax1.plot(minutes, abs_curve, linewidth=2, label="Absolute glucose (mg/dL)")
-    ax1.set_xlabel("Minutes after meal")
-    ax1.set_ylabel("mg/dL")
-    ax1.grid(True, alpha=0.25)
+def _to_float(x: object) -> float:
+    """Scalar equivalent of pd.to_numeric(errors="coerce")."""
+    if x is None:
+        return np.nan
+    try:
+        return float(x)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _coerce_numeric(vals: Any) -> np.ndarray:
+    """Sized iterable of raw numeric payload values -> float64 vector (None/unparsable -> NaN)."""
+    return np.fromiter(map(_to_float, vals), dtype=np.float64, count=len(vals))
+
+
+@lru_cache(maxsize=None)
+def _forest_kernel(n_trees: int, n_vals: int) -> Any:
+    """
+    Numba tree-walk kernel for a packed forest (see ``PredictionModel._pack_forest``),
+    compiled once per forest shape. The tree count and values-per-leaf (120 for a
+    native multi-output forest) are closure constants, so LLVM sees fixed trip
+    counts and can unroll/vectorize the per-leaf accumulate. Raises ImportError
+    when numba isn't installed.
+    """
+    from numba import njit, prange
+
+    NT, OUT = n_trees, n_vals
+
+    @njit(parallel=True, fastmath=True, boundscheck=False)
+    def kernel(X, left, right, feature, threshold, value, out_col, scale, out):
+        # Samples run in parallel; each owns its output row, so no accumulation races.
+        for s in prange(X.shape[0]):
+            for t in range(NT):
+                node = 0
+                while left[t, node] != -1:
+                    if X[s, feature[t, node]] <= threshold[t, node]:
+                        node = left[t, node]
+                    else:
+                        node = right[t, node]
+                c = out_col[t]
+                w = scale[t]
+                for k in range(OUT):
+                    out[s, c + k] += value[t, node, k] * w
+
+    return kernel
+
+
+def _node_count(reg: Any) -> int:
+    """Total tree nodes in a RandomForest, or a MultiOutputRegressor of them."""
+    forests = reg.estimators_ if hasattr(reg.estimators_[0], "estimators_") else [reg]
+    return sum(tree.tree_.node_count for forest in forests for tree in forest.estimators_)
+
+
+_plot_local = threading.local()
+
+# Bounded pool for predict_many's per-item plot/CSV/JSON work; long-lived so each
+# worker thread's cached Figure survives across calls.
+_finalize_pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1),
+                                    thread_name_prefix="predict-finalize")
+
+
+def _draw_curves(minutes: np.ndarray, abs_curve: np.ndarray, delta_curve: np.ndarray) -> Figure:
+    """Draw both curves on this thread's cached Figure and return it."""
+    cached = getattr(_plot_local, "fig", None)
+    if cached is None:
+        # matplotlib is imported on first draw, keeping it out of module import time.
+        # Only the Agg canvas is used, so pyplot and GUI backends are never loaded.
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        # Bare Agg canvas with fixed margins: no tight_layout / bbox_inches="tight" passes.
+        fig = Figure(figsize=(8, 4.5), dpi=100)
+        FigureCanvasAgg(fig)
+        fig.subplots_adjust(left=0.09, right=0.91, bottom=0.11, top=0.97)
+        ax1 = fig.subplots()
+        ax2 = ax1.twinx()
+
+        # Static artists are built once; each call only swaps the line data.
+        (line_abs,) = ax1.plot([], [], linewidth=2, label="Absolute glucose (mg/dL)")
+        ax1.set_xlabel("Minutes after meal")
+        ax1.set_ylabel("mg/dL")
+        ax1.grid(True, alpha=0.25)
+
+        (line_delta,) = ax2.plot([], [], linewidth=1.5, linestyle="--", label="ΔGlucose (mg/dL)", alpha=0.9)
+        ax2.set_ylabel("Δ mg/dL")
+
+        ax1.axvline(0, linestyle="--", alpha=0.5)
+        ax1.legend(loc="upper left")
+        ax2.legend(loc="upper right")
+        _plot_local.fig = cached = (fig, ax1, ax2, line_abs, line_delta)
+    fig, ax1, ax2, line_abs, line_delta = cached
+    line_abs.set_data(minutes, abs_curve)
+    line_delta.set_data(minutes, delta_curve)
+
+    # Explicit limits (x spans the meal marker at 0) instead of autoscaling.
+    ax1.set_xlim(*_padded_limits(min(0.0, float(minutes[0])), float(minutes[-1])))
+    ax1.set_ylim(*_padded_limits(float(np.min(abs_curve)), float(np.max(abs_curve))))
+    ax2.set_ylim(*_padded_limits(float(np.min(delta_curve)), float(np.max(delta_curve))))
+    return fig
+
+
+def _padded_limits(lo: float, hi: float) -> Tuple[float, float]:
+    """Same 5% margin matplotlib's autoscale would add."""
+    pad = (hi - lo) * 0.05 or 1.0
+    return lo - pad, hi + pad
+
+
+def _encode_png(fig: Figure, target: Any) -> None:
+    """Rasterize ``fig`` and PNG-encode its RGBA buffer without an intermediate copy."""
+    from PIL import Image  # Pillow ships with matplotlib
+
+    canvas = fig.canvas
+    canvas.draw()
+    rgba = canvas.buffer_rgba()  # memoryview over the Agg renderer's pixels
+    Image.frombuffer("RGBA", canvas.get_width_height(), rgba, "raw", "RGBA", 0, 1).save(target, format="PNG")
+
+
+def _render_png_bytes(minutes: np.ndarray, abs_curve: np.ndarray, delta_curve: np.ndarray) -> bytes:
+    """
+    PNG of absolute and delta curves, rendered once; callers write and/or base64
+    the same bytes rather than drawing the figure per destination.
+    """
+    fig = _draw_curves(minutes, abs_curve, delta_curve)
+    buf = io.BytesIO()
+    _encode_png(fig, buf)
+    return buf.getvalue()
+
+
+# Pillow renderer: same 800x450 canvas and axes margins as the matplotlib figure.
+_PLOT_SIZE = (800, 450)
+_PLOT_BOX = (72, 14, 728, 400)  # left, top, right, bottom of the axes area
+_ABS_COLOR = (31, 119, 180)
+_DELTA_COLOR = (255, 127, 14)
+_GRID_COLOR = (230, 230, 230)
+
+
+def _nice_ticks(lo: float, hi: float, target: int = 8) -> np.ndarray:
+    """Round tick positions (1/2/2.5/5 x 10^k steps) inside [lo, hi]."""
+    raw = (hi - lo) / target
+    mag = 10.0 ** np.floor(np.log10(raw))
+    step = next(m * mag for m in (1.0, 2.0, 2.5, 5.0, 10.0) if m * mag >= raw)
+    return np.arange(np.ceil(lo / step) * step, hi + step * 1e-9, step) + 0.0  # no "-0" labels
 
-    ax2 = ax1.twinx()
-    ax2.plot(minutes, delta_curve, linewidth=1.5, linestyle="--", label="ΔGlucose (mg/dL)", alpha=0.9)
-    ax2.set_ylabel("Δ mg/dL")
 
-    ax1.axvline(0, linestyle="--", alpha=0.5)
-    ax1.legend(loc="upper left")
-    ax2.legend(loc="upper right")
-    fig.tight_layout()
+def _to_px(v: Any, lim: Tuple[float, float], p0: float, p1: float) -> Any:
+    """Map data value(s) in ``lim`` linearly onto the pixel span p0..p1."""
+    return p0 + (np.asarray(v, dtype=np.float64) - lim[0]) * ((p1 - p0) / (lim[1] - lim[0]))
+
+
+def _dashed_line(draw: Any, xs: np.ndarray, ys: np.ndarray, fill: Any, width: int,
+                 dash: float = 7.0, gap: float = 4.0) -> None:
+    """Polyline with a dash pattern measured along its length."""
+    seg = np.hypot(np.diff(xs), np.diff(ys))
+    dist = np.concatenate(([0.0], np.cumsum(seg)))
+    period = dash + gap
+    for start in np.arange(0.0, dist[-1], period):
+        stop = min(start + dash, dist[-1])
+        keep = (dist > start) & (dist < stop)
+        px = np.concatenate(([np.interp(start, dist, xs)], xs[keep], [np.interp(stop, dist, xs)]))
+        py = np.concatenate(([np.interp(start, dist, ys)], ys[keep], [np.interp(stop, dist, ys)]))
+        draw.line(list(zip(px.tolist(), py.tolist())), fill=fill, width=width)
+
+
+@lru_cache(maxsize=None)
+def _plot_font() -> Any:
+    """DejaVu Sans from matplotlib's bundled fonts (located without importing it), for the Δ glyph."""
+    from importlib.util import find_spec
+    from PIL import ImageFont  # Pillow ships with matplotlib
+
+    spec = find_spec("matplotlib")
+    if spec is not None and spec.submodule_search_locations:
+        ttf = Path(spec.submodule_search_locations[0]) / "mpl-data" / "fonts" / "ttf" / "DejaVuSans.ttf"
+        if ttf.exists():
+            return ImageFont.truetype(str(ttf), 13)
+    return ImageFont.load_default(size=12)
+
+
+@lru_cache(maxsize=8)
+def _plot_layers(xlim: Tuple[float, float]) -> Tuple[Any, List[Tuple[Any, Tuple[int, int]]]]:
+    """
+    Static parts of the Pillow chart for one x-range, built once: the background
+    (x grid/ticks, meal marker, frame, axis labels) and the legend patches with
+    their paste positions, which go on top of the curves.
+    """
+    from PIL import Image, ImageDraw
+
+    font = _plot_font()
+    left, top, right, bottom = _PLOT_BOX
+    img = Image.new("RGB", _PLOT_SIZE, "white")
+    d = ImageDraw.Draw(img)
+    for t in _nice_ticks(*xlim):
+        x = float(_to_px(t, xlim, left, right))
+        d.line([(x, top), (x, bottom)], fill=_GRID_COLOR)
+        d.line([(x, bottom), (x, bottom + 4)], fill="black")
+        d.text((x, bottom + 6), f"{t:g}", fill="black", font=font, anchor="mt")
+    x0 = float(_to_px(0.0, xlim, left, right))
+    _dashed_line(d, np.array([x0, x0]), np.array([float(top), float(bottom)]), (150, 150, 150), 1)
+    d.rectangle(_PLOT_BOX, outline="black")
+    d.text(((left + right) / 2, bottom + 26), "Minutes after meal", fill="black", font=font, anchor="mt")
+    for text, cx in (("mg/dL", 14), ("Δ mg/dL", _PLOT_SIZE[0] - 14)):
+        w, h = int(font.getlength(text)) + 2, 16
+        label = Image.new("RGB", (w, h), "white")
+        ImageDraw.Draw(label).text((1, h // 2), text, fill="black", font=font, anchor="lm")
+        label = label.rotate(90, expand=True)
+        img.paste(label, (cx - h // 2, (top + bottom - w) // 2))
+
+    patches = []
+    for text, color, dashed, anchor_right in (("Absolute glucose (mg/dL)", _ABS_COLOR, False, False),
+                                              ("ΔGlucose (mg/dL)", _DELTA_COLOR, True, True)):
+        w, h = int(font.getlength(text)) + 44, 22
+        patch = Image.new("RGB", (w, h), "white")
+        pd_ = ImageDraw.Draw(patch)
+        pd_.rectangle((0, 0, w - 1, h - 1), outline=(204, 204, 204))
+        if dashed:
+            _dashed_line(pd_, np.array([8.0, 32.0]), np.array([h / 2, h / 2]), color, 2)
+        else:
+            pd_.line([(8, h / 2), (32, h / 2)], fill=color, width=2)
+        pd_.text((38, h / 2), text, fill="black", font=font, anchor="lm")
+        x = right - 8 - w if anchor_right else left + 8
+        patches.append((patch, (x, top + 8)))
+    return img, patches
+
+
+def _render_png_fast(minutes: np.ndarray, abs_curve: np.ndarray, delta_curve: np.ndarray) -> bytes:
+    """
+    Same chart as ``_render_png_bytes`` drawn straight onto a Pillow canvas: a copy
+    of the cached static layer, y grid/ticks for both axes, the two polylines and
+    the legend. No matplotlib layout work, and nothing shared is mutated, so it is
+    safe from any thread.
+    """
+    from PIL import ImageDraw
+
+    left, top, right, bottom = _PLOT_BOX
+    xlim = _padded_limits(min(0.0, float(minutes[0])), float(minutes[-1]))
+    ylim_abs = _padded_limits(float(np.min(abs_curve)), float(np.max(abs_curve)))
+    ylim_delta = _padded_limits(float(np.min(delta_curve)), float(np.max(delta_curve)))
+    background, legend = _plot_layers(xlim)
+    font = _plot_font()
+
+    img = background.copy()
+    d = ImageDraw.Draw(img)
+    for t in _nice_ticks(*ylim_abs):
+        y = float(_to_px(t, ylim_abs, bottom, top))
+        d.line([(left + 1, y), (right - 1, y)], fill=_GRID_COLOR)
+        d.line([(left - 4, y), (left, y)], fill="black")
+        d.text((left - 6, y), f"{t:g}", fill="black", font=font, anchor="rm")
+    for t in _nice_ticks(*ylim_delta):
+        y = float(_to_px(t, ylim_delta, bottom, top))
+        d.line([(right, y), (right + 4, y)], fill="black")
+        d.text((right + 6, y), f"{t:g}", fill="black", font=font, anchor="lm")
+
+    xs = _to_px(minutes, xlim, left, right)
+    y_abs = _to_px(abs_curve, ylim_abs, bottom, top)
+    d.line(list(zip(xs.tolist(), y_abs.tolist())), fill=_ABS_COLOR, width=2, joint="curve")
+    _dashed_line(d, xs, _to_px(delta_curve, ylim_delta, bottom, top), _DELTA_COLOR, 2)
+    for patch, pos in legend:
+        img.paste(patch, pos)
 
     buf = io.BytesIO()
-    plt.savefig(buf, format="png", dpi=150, bbox_inches="tight")
-    plt.close(fig)
-    buf.seek(0)
-    return base64.b64encode(buf.read()).decode("utf-8")
-
-
-def _save_plot_png(path: Path, minutes: np.ndarray, abs_curve: np.ndarray, delta_curve: np.ndarray) -> None:
-    """Save a PNG plot to 'path'."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    fig, ax1 = plt.subplots(figsize=(8, 4.5))
-    ax1.plot(minutes, abs_curve, linewidth=2, label="Absolute glucose (mg/dL)")
-    ax1.set_xlabel("Minutes after meal")
-    ax1.set_ylabel("mg/dL")
-    ax1.grid(True, alpha=0.25)
-
-    ax2 = ax1.twinx()
-    ax2.plot(minutes, delta_curve, linewidth=1.5, linestyle="--", label="ΔGlucose (mg/dL)", alpha=0.9)
-    ax2.set_ylabel("Δ mg/dL")
-
-    ax1.axvline(0, linestyle="--", alpha=0.5)
-    ax1.legend(loc="upper left")
-    ax2.legend(loc="upper right")
-    fig.tight_layout()
-    plt.savefig(path, format="png", dpi=150, bbox_inches="tight")
-    plt.close(fig)
-
-
-def _build_csv(df_row: pd.Series,
+    img.save(buf, format="PNG", compress_level=1)
+    return buf.getvalue()
+
+
+def _build_csv(inputs: Mapping[str, Any],
                minutes: np.ndarray,
                delta_curve: np.ndarray,
                abs_curve: np.ndarray) -> str:
@@ -88,19 +322,42 @@ def _build_csv(df_row: pd.Series,
     CSV with per-minute rows + all input fields replicated.
     Columns: minute, delta_glucose, absolute_glucose, <input fields...>
     """
-    base = pd.DataFrame({
+    # Scalar input values broadcast down the 120 rows; no replicated frame + concat.
+    out = pd.DataFrame({
         "minute": minutes.astype(int),
         "delta_glucose": delta_curve.astype(float),
         "absolute_glucose": abs_curve.astype(float),
+        **inputs,
     })
-    inputs_df = pd.DataFrame([df_row.to_dict()])
-    repeated = pd.concat([inputs_df]*len(base), ignore_index=True)
-    out = pd.concat([base, repeated], axis=1)
     return out.to_csv(index=False)
 
 
+def _dumps(obj: Any) -> str:
+    """JSON-encode a result; numpy arrays are serialized directly from their buffers."""
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+
+
+def _write_json(path: Path, obj: Any) -> None:
+    path.write_bytes(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2))
+
+
+_ts_counter = itertools.count()
+_ts_second: Tuple[float, str] = (-1.0, "")
+
+
 def _ts() -> str:
-    return datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    """
+    Unique file stamp: a wall-clock second (re-formatted at most once a second)
+    plus the pid and a per-process counter, so stamps never collide the way two
+    calls in the same microsecond could.
+    """
+    global _ts_second
+    now = monotonic()
+    refreshed, text = _ts_second
+    if now - refreshed >= 1.0:
+        text = datetime.now().strftime("%Y%m%d-%H%M%S")
+        _ts_second = (now, text)
+    return f"{text}-{os.getpid()}-{next(_ts_counter)}"
 
 
 # ----------------------------- model -----------------------------
@@ -113,16 +370,32 @@ class PredictionModel:
       - a direct path to that pickle file.
 
     The pickle is expected to be a Pipeline:
-      preprocess (ColumnTransformer) -> MultiOutputRegressor(RandomForestRegressor)
+      preprocess (ColumnTransformer) -> RandomForestRegressor (native multi-output,
+      as train.py fits it); older MultiOutputRegressor(RandomForestRegressor)
+      artifacts still load.
     """
 
+    # Minute grid shared by every result; read-only since the same array is
+    # handed to every plot/CSV/JSON call.
+    _MINUTES = np.arange(1, 121, dtype=np.int64)
+    _MINUTES.setflags(write=False)
+
+    # Batches below this size skip joblib parallelism in the sklearn regressor.
+    _SMALL_BATCH = 8
+
     def __init__(self,
                  artifact: str | Path = "ml_outputs_mlcurve_rf",
                  n_jobs_targets: Optional[int] = None,
                  n_jobs_trees: int = 1,
                  output_dir: str | Path = "pred_outputs",
                  save_plot: bool = True,
-                 save_json: bool = True) -> None:
+                 save_json: bool = True,
+                 use_onnx: bool = False,
+                 use_numba: bool = False,
+                 use_leaf_table: bool = False,
+                 quantize_leaves: bool = False,
+                 plot_backend: str = "matplotlib",
+                 cache_models: bool = True) -> None:
         """
         Params
         ------
@@ -139,13 +412,46 @@ class PredictionModel:
             By default, save PNG to disk and include its path.
         save_json : bool
             By default, save the JSON result to disk and include its path.
+        use_onnx : bool
+            Opt in to ONNX Runtime for the regressor. A ``model_multioutput.onnx``
+            beside the pickle (``convert_to_onnx``) is loaded as-is; without one the
+            forest is converted with skl2onnx here, which is slow for large forests.
+            Falls back to sklearn if onnxruntime is missing or conversion fails.
+        use_numba : bool
+            Opt in to a Numba-compiled tree walk over the forest's node arrays, used
+            ahead of ONNX/sklearn. Ignored if numba is missing or the forest layout
+            isn't supported.
+        use_leaf_table : bool
+            Opt in to predicting through a packed leaf-value table gathered by each
+            tree's ``apply`` instead of ``reg.predict``. The table is a padded copy
+            of every tree's leaf values (n_trees x max_nodes x 120 float64 unless
+            ``quantize_leaves``), held privately by each process.
+        quantize_leaves : bool
+            Store the packed leaf values as int16 with a per-tree scale (a quarter of
+            the float64 table's memory traffic) for the leaf-table and Numba paths.
+            Lossy: each curve value moves by at most max|leaf value| / 65520, e.g.
+            0.003 mg/dL for leaves up to 200 mg/dL (see ``_pack_forest``).
+        plot_backend : str
+            "matplotlib" (default) renders the Agg figure; "pillow" opts in to
+            drawing a look-alike chart directly onto a Pillow canvas, which is
+            faster but differs in fonts and tick layout.
+        cache_models : bool
+            Reuse an already-loaded pipeline for the same artifact path. Loads use
+            ``mmap_mode="r"``, so large arrays in an uncompressed artifact
+            (``joblib.dump(..., compress=0)``) are backed by the shared page cache.
         """
         # (Optional) be nice to BLAS if present
         os.environ.setdefault("OMP_NUM_THREADS", "1")
         os.environ.setdefault("MKL_NUM_THREADS", "1")
 
         self.model_path = self._resolve_model_path(artifact)
-        self._model = joblib.load(self.model_path)
+        key = self.model_path.resolve()
+        model = _MODEL_CACHE.get(key) if cache_models else None
+        if model is None:
+            model = joblib.load(self.model_path, mmap_mode="r")
+            if cache_models:
+                _MODEL_CACHE[key] = model
+        self._model = model
 
         # input schema
         try:
@@ -158,17 +464,43 @@ class PredictionModel:
                 "Age","Body weight","Height","activity_cal_mean","mets_mean"
             ]
             cat_cols_input = ["meal_bucket","Gender"]
-        self.expected_columns: List[str] = num_cols + cat_cols_input
+        self.expected_columns: Tuple[str, ...] = tuple(num_cols + cat_cols_input)
+        # column positions, so a payload can be written straight into a row array
+        self._num_idx: List[int] = list(range(len(num_cols)))
+        self._cat_idx: List[int] = list(range(len(num_cols), len(self.expected_columns)))
+        self._baseline_pos = num_cols.index("baseline_avg_glucose")
+
+        # Split the pipeline so the regressor can be fed a float32 matrix directly;
+        # sklearn trees cast to float32 internally, so this skips a copy per predict.
+        try:
+            self._preprocess = self._model.named_steps["preprocess"]
+            self._reg = self._model.named_steps["reg"]
+        except Exception:
+            self._preprocess = self._reg = None
+        self._fast = self._build_fast_transform()
 
         # speed tuning
         self._optimize_parallelism(n_jobs_targets=n_jobs_targets, n_jobs_trees=n_jobs_trees)
+        self._reg_small = self._single_job_regressor()
+        self._ort = self._compile_onnx() if use_onnx else None
+        # Padded node/leaf arrays, built on first use by a backend that walks them.
+        self._quantize_leaves = bool(quantize_leaves)
+        self._packed: Optional[Tuple[np.ndarray, ...]] = None
+        self._leaf = self._compile_leaf_table() if use_leaf_table else None
+        self._numba = self._compile_numba() if use_numba else None
 
         # output management
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.save_plot = bool(save_plot)
+        renderers = {"pillow": _render_png_fast, "matplotlib": _render_png_bytes}
+        if plot_backend not in renderers:
+            raise ValueError(f"plot_backend must be one of: {', '.join(renderers)}")
+        self._render_png = renderers[plot_backend]
         self.save_json = bool(save_json)
 
+        self.warmup_seconds = self._warmup()
+
     # ----- path handling -----
     @staticmethod
     def _resolve_model_path(artifact: str | Path) -> Path:
@@ -199,19 +531,252 @@ class PredictionModel:
 
     # ----- speed tuning -----
     def _optimize_parallelism(self, n_jobs_targets: Optional[int], n_jobs_trees: int) -> None:
+        """
+        Apply the n_jobs settings to a per-instance shallow copy of the regressor
+        (and of its per-target estimators), so predictors sharing a cached pipeline
+        keep their own parallelism and the cached object is never modified.
+        """
         try:
             reg = self._model.named_steps.get("reg", None)
             if reg is None:
                 return
+            reg = copy.copy(reg)
             if (n_jobs_targets is not None) and hasattr(reg, "n_jobs"):
                 reg.n_jobs = n_jobs_targets
             if hasattr(reg, "estimators_") and reg.estimators_:
+                estimators = []
                 for est in reg.estimators_:
                     if hasattr(est, "n_jobs"):
+                        est = copy.copy(est)
                         est.n_jobs = int(n_jobs_trees)
+                    estimators.append(est)
+                reg.estimators_ = estimators
+            pipe = copy.copy(self._model)
+            pipe.steps = [(name, reg if name == "reg" else step) for name, step in pipe.steps]
+            self._model = pipe
+            self._reg = reg
         except Exception:
             pass
 
+    def _single_job_regressor(self) -> Any:
+        """
+        Shallow copy of the regressor with n_jobs=1 for small batches, where joblib
+        dispatch costs more than it saves. The copy shares the fitted estimators, and
+        swapping objects (rather than flipping n_jobs around each call) stays safe
+        when several threads predict on the same cached model.
+        """
+        reg = self._reg
+        if reg is None or getattr(reg, "n_jobs", None) in (None, 1):
+            return reg
+        small = copy.copy(reg)
+        small.n_jobs = 1
+        return small
+
+    def _onnx_bytes(self) -> bytes:
+        """Serialize the fitted regressor (float32 matrix in, curves out) as ONNX."""
+        from skl2onnx import convert_sklearn
+        from skl2onnx.common.data_types import FloatTensorType
+
+        onx = convert_sklearn(
+            self._reg,
+            initial_types=[("input", FloatTensorType([None, int(self._reg.n_features_in_)]))],
+            final_types=[("variable", FloatTensorType([None, None]))],
+        )
+        return onx.SerializeToString()
+
+    def _compile_onnx(self) -> Any:
+        """
+        ONNX Runtime session for the regressor, or None if unavailable. A
+        ``model_multioutput.onnx`` next to the pickle (see ``convert_to_onnx``) is
+        loaded as-is, after checking it agrees with sklearn on a probe row;
+        otherwise the regressor is converted in memory.
+        """
+        if self._reg is None:
+            return None
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            return None
+        sibling = self.model_path.with_suffix(".onnx")
+        if sibling.exists():
+            try:
+                sess = ort.InferenceSession(str(sibling), providers=["CPUExecutionProvider"])
+                probe = np.zeros((1, int(self._reg.n_features_in_)), dtype=np.float32)
+                if np.allclose(sess.run(None, {"input": probe})[0], self._reg.predict(probe), atol=1e-3):
+                    return sess
+            except Exception:
+                pass  # stale or foreign file: fall back to converting
+        try:
+            return ort.InferenceSession(self._onnx_bytes(), providers=["CPUExecutionProvider"])
+        except Exception:
+            return None
+
+    def convert_to_onnx(self, out_path: str | Path | None = None) -> Path:
+        """
+        Write the regressor as ONNX (default: ``model_multioutput.onnx`` beside the
+        pickle) so later loads skip the skl2onnx conversion. Preprocessing stays in
+        Python; the pickle is still required for it.
+        """
+        out = Path(out_path) if out_path is not None else self.model_path.with_suffix(".onnx")
+        out.write_bytes(self._onnx_bytes())
+        return out
+
+    def _forest_trees(self) -> Optional[List[Tuple[int, int, Any]]]:
+        """
+        ``(first output column, trees in its forest, tree_)`` for every fitted tree.
+        A native multi-output forest's trees write all curve columns from column 0;
+        a MultiOutputRegressor contributes one forest per column.
+        """
+        reg = self._reg
+        try:
+            if hasattr(reg.estimators_[0], "estimators_"):  # MultiOutputRegressor
+                groups = [(col, forest.estimators_) for col, forest in enumerate(reg.estimators_)]
+            else:
+                groups = [(0, reg.estimators_)]
+            return [(col, len(ts), t.tree_) for col, ts in groups for t in ts]
+        except Exception:
+            return None
+
+    def _packed_forest(self) -> Optional[Tuple[np.ndarray, ...]]:
+        """``_pack_forest`` output, built once and shared by the Numba and leaf-table paths."""
+        if self._packed is None:
+            self._packed = self._pack_forest(quantize=self._quantize_leaves)
+        return self._packed
+
+    def _pack_forest(self, quantize: bool = False) -> Optional[Tuple[np.ndarray, ...]]:
+        """
+        Flatten every tree's node arrays into padded (n_trees, max_nodes[, n_vals])
+        buffers for ``_forest_kernel``. ``scale`` holds 1/len(forest) so summing
+        scaled leaf values over a forest gives its mean. With ``quantize``, ``value``
+        is int16 and ``scale`` also carries each tree's dequantization step.
+
+        Quantization error bound: a tree's leaves are rounded to a step of
+        max|leaf value in that tree| / 32760, so each is off by at most half a step.
+        A forest averages its trees, so every predicted value is within the mean of
+        those half-steps, and never more than max|leaf value| / 65520, of
+        ``reg.predict``. The leaf-table path adds float32 rounding of the gathered
+        leaves on top (relative 6e-8).
+        """
+        trees = self._forest_trees()
+        if not trees:
+            return None
+        # The kernel ignores missing_go_to_left: rows reach it already imputed.
+        n_trees = len(trees)
+        max_nodes = max(t.node_count for _, _, t in trees)
+        n_vals = trees[0][2].value.shape[1]
+        left = np.full((n_trees, max_nodes), -1, dtype=np.int64)
+        right = np.full((n_trees, max_nodes), -1, dtype=np.int64)
+        feature = np.zeros((n_trees, max_nodes), dtype=np.int64)
+        threshold = np.zeros((n_trees, max_nodes), dtype=np.float64)
+        value = np.zeros((n_trees, max_nodes, n_vals), dtype=np.float64)
+        out_col = np.empty(n_trees, dtype=np.int64)
+        scale = np.empty(n_trees, dtype=np.float64)
+        for i, (col, n_in_forest, t) in enumerate(trees):
+            n = t.node_count
+            left[i, :n] = t.children_left
+            right[i, :n] = t.children_right
+            feature[i, :n] = np.maximum(t.feature, 0)  # leaves carry -2
+            threshold[i, :n] = t.threshold
+            value[i, :n] = t.value[:, :, 0]
+            out_col[i] = col
+            scale[i] = 1.0 / n_in_forest
+        if quantize:
+            step = np.abs(value).max(axis=(1, 2)) / 32760.0
+            step[step == 0] = 1.0
+            value = np.rint(value / step[:, None, None]).astype(np.int16)
+            scale *= step
+        return left, right, feature, threshold, value, out_col, scale
+
+    @staticmethod
+    def _packed_atol(packed: Tuple[np.ndarray, ...]) -> float:
+        """Probe-check tolerance: rounding bound of a quantized table, else float noise."""
+        _, _, _, _, value, out_col, scale = packed
+        if value.dtype != np.int16:
+            return 1e-6
+        # Each tree is off by at most half a step; summed (scaled) per output column.
+        return 0.5 * float(np.bincount(out_col, weights=scale).max()) + 1e-4
+
+    def _compile_numba(self) -> Any:
+        """
+        ``Xt -> curves`` callable backed by ``_forest_kernel``, or None if numba is
+        unavailable or the packed forest doesn't match sklearn on a probe row. The
+        forest is only packed once numba has imported.
+        """
+        try:
+            import numba  # noqa: F401
+        except ImportError:
+            return None
+        packed = self._packed_forest()
+        if packed is None:
+            return None
+        try:
+            kernel = _forest_kernel(packed[4].shape[0], packed[4].shape[2])
+        except Exception:
+            return None
+        n_outputs = int(packed[5].max()) + packed[4].shape[2]
+
+        def run(Xt: np.ndarray) -> np.ndarray:
+            out = np.zeros((Xt.shape[0], n_outputs), dtype=np.float64)
+            kernel(Xt, *packed, out)
+            return out
+
+        try:
+            probe = np.zeros((1, int(self._reg.n_features_in_)), dtype=np.float32)
+            if not np.allclose(run(probe), self._reg.predict(probe), rtol=0, atol=self._packed_atol(packed)):
+                return None
+        except Exception:
+            return None
+        return run
+
+    def _compile_leaf_table(self) -> Any:
+        """
+        ``Xt -> curves`` callable that replaces ``reg.predict``: each tree's Cython
+        ``apply`` gives leaf ids, which index the packed leaf-value table (mean scale
+        applied to the gathered leaves), and one reduction over trees sums the forest.
+        No joblib dispatch and no per-estimator input validation. None if the forest
+        can't be packed.
+        """
+        packed = self._packed_forest()
+        if packed is None:
+            return None
+        trees = [t for _, _, t in self._forest_trees()]
+        _, _, _, _, table, out_col, scale = packed
+        # Scaling only the gathered leaves avoids a second full-size copy of the
+        # table; an int16 table is dequantized the same way.
+        factor = scale.astype(np.float32 if table.dtype == np.int16 else np.float64)[:, None, None]
+        tree_idx = np.arange(len(trees))[:, None]
+        n_vals = table.shape[2]
+        n_outputs = int(out_col.max()) + n_vals
+
+        def run(Xt: np.ndarray) -> np.ndarray:
+            leaves = np.stack([t.apply(Xt) for t in trees])  # (n_trees, n_samples)
+            contrib = table[tree_idx, leaves] * factor  # (n_trees, n_samples, n_vals)
+            if n_vals == n_outputs:  # native multi-output forest
+                return np.add.reduce(contrib, axis=0, dtype=np.float64)
+            out = np.zeros((n_outputs, Xt.shape[0]), dtype=np.float64)
+            np.add.at(out, out_col, contrib[:, :, 0])  # one column per forest
+            return out.T
+
+        try:
+            probe = np.zeros((1, int(self._reg.n_features_in_)), dtype=np.float32)
+            if not np.allclose(run(probe), self._reg.predict(probe), rtol=0, atol=self._packed_atol(packed)):
+                return None
+        except Exception:
+            return None
+        return run
+
+    def _warmup(self) -> Optional[float]:
+        """Push one dummy row through the predict path so the first request isn't the slow one."""
+        dummy = {"baseline_avg_glucose": 0.0, "meal_type": "Lunch", "Gender": "Unknown"}
+        start = perf_counter()
+        try:
+            self._predict_matrix(self._payload_to_array(dummy)[0])
+            if self.save_plot:  # loads the plotting stack now rather than on the first request
+                self._render_png(self._MINUTES, np.zeros(120), np.zeros(120))
+        except Exception:
+            return None
+        return perf_counter() - start
+
     # ----- schema utilities -----
     def expected_features(self) -> List[str]:
         return list(self.expected_columns)
@@ -220,8 +785,147 @@ class PredictionModel:
         import sklearn, numpy
         return {"sklearn": sklearn.__version__, "numpy": numpy.__version__}
 
+    # ----- offline artifact tooling -----
+    def prune_and_save(self, alpha: float, out_path: str | Path,
+                       X: pd.DataFrame, Y: np.ndarray) -> Dict[str, int]:
+        """
+        Refit the artifact's regressor with cost-complexity pruning (``ccp_alpha``)
+        and save the smaller pipeline.
+
+        Build-time only. ``X``/``Y`` are the training features and (N, 120) targets
+        the artifact was fit on; the fitted preprocessing is reused, and with the
+        forest's fixed ``random_state`` every tree is its original pruned at
+        ``alpha``. The live model is untouched; point a new PredictionModel at
+        ``out_path`` to serve the smaller forest. Returns node counts before/after.
+        """
+        from sklearn.base import clone
+        from sklearn.multioutput import MultiOutputRegressor
+
+        pipe = joblib.load(self.model_path)
+        preprocess, reg = pipe.named_steps["preprocess"], pipe.named_steps["reg"]
+        Xt = preprocess.transform(X)
+        if hasattr(Xt, "toarray"):
+            Xt = Xt.toarray()
+        Xt = np.ascontiguousarray(Xt, dtype=np.float32)
+
+        pruned = clone(reg)
+        if isinstance(pruned, MultiOutputRegressor):
+            pruned.set_params(estimator__ccp_alpha=float(alpha))
+        else:
+            pruned.set_params(ccp_alpha=float(alpha))
+        pruned.fit(Xt, Y)
+        pipe.set_params(reg=pruned)
+
+        out = Path(out_path)
+        if out.suffix.lower() != ".pkl":
+            out = out / "model_multioutput.pkl"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(pipe, out)
+        return {"nodes_before": _node_count(reg), "nodes_after": _node_count(pruned)}
+
+    # ----- preprocessing fast path -----
+    def _build_fast_transform(self) -> Optional[Tuple[np.ndarray, List[Tuple[Any, Dict[Any, int]]], int]]:
+        """
+        Lift the fitted ColumnTransformer's parameters (numeric median fill values,
+        categorical fill values and one-hot column positions) so rows can be
+        transformed with plain numpy. Returns None when the preprocessor isn't the
+        imputer / imputer+one-hot layout train.py builds, or doesn't reproduce
+        ``preprocess.transform`` on a probe row.
+        """
+        if self._preprocess is None:
+            return None
+        try:
+            (_, num_imp, num_cols), (_, cat_pipe, cat_cols) = self._preprocess.transformers_[:2]
+            rest = self._preprocess.transformers_[2:]
+            if any(t != "drop" for _, t, _ in rest):
+                return None
+            if tuple(num_cols) + tuple(cat_cols) != self.expected_columns:
+                return None
+            cat_imp, oh = cat_pipe.named_steps["imp"], cat_pipe.named_steps["oh"]
+            if getattr(num_imp, "add_indicator", False) or getattr(cat_imp, "add_indicator", False):
+                return None
+            if oh.drop is not None or any(getattr(oh, "infrequent_categories_", None) or []):
+                return None
+
+            num_fill = np.asarray(num_imp.statistics_, dtype=np.float64)
+            if num_fill.shape != (len(num_cols),) or np.isnan(num_fill).any():
+                return None
+            offset = len(num_cols)
+            cat_maps: List[Tuple[Any, Dict[Any, int]]] = []
+            for fill, cats in zip(cat_imp.statistics_, oh.categories_):
+                cat_maps.append((fill, {c: offset + k for k, c in enumerate(cats)}))
+                offset += len(cats)
+            fast = (num_fill, cat_maps, offset)
+
+            probe = self._payload_to_array({"baseline_avg_glucose": 0.0, "meal_type": "Lunch"})[0]
+            ref = self._preprocess.transform(self._frame(probe))
+            if hasattr(ref, "toarray"):
+                ref = ref.toarray()
+            if not np.allclose(self._transform_fast(probe, fast), ref, equal_nan=True):
+                return None
+            return fast
+        except Exception:
+            return None
+
+    def _transform_fast(self, rows: np.ndarray, fast: Tuple[np.ndarray, List[Tuple[Any, Dict[Any, int]]], int]) -> np.ndarray:
+        """numpy equivalent of ``preprocess.transform`` for an (N, F) object row array."""
+        num_fill, cat_maps, width = fast
+        # Row-major float32 matrix: the layout the regressor consumes without a copy.
+        Xt = np.zeros((rows.shape[0], width), dtype=np.float32, order="C")
+        nums = rows[:, self._num_idx].astype(np.float64)
+        Xt[:, :len(num_fill)] = np.where(np.isnan(nums), num_fill, nums)
+        for r in range(rows.shape[0]):
+            for i, (fill, index) in zip(self._cat_idx, cat_maps):
+                v = rows[r, i]
+                if v is None or v != v:  # missing -> most_frequent
+                    v = fill
+                col = index.get(v)
+                if col is not None:  # unknown categories stay all-zero (handle_unknown="ignore")
+                    Xt[r, col] = 1.0
+        return Xt
+
+    def _frame(self, rows: np.ndarray) -> pd.DataFrame:
+        """Wrap an (N, F) row array for the sklearn fallbacks that need column names."""
+        return pd.DataFrame(rows, columns=self.expected_columns, copy=False)
+
+    def _predict_matrix(self, rows: np.ndarray) -> np.ndarray:
+        """Run the pipeline on an (N, F) row array, handing the regressor a C-contiguous float32 matrix."""
+        if self._reg is None:
+            return self._model.predict(self._frame(rows))
+        if self._fast is not None:
+            Xt = self._transform_fast(rows, self._fast)
+        else:
+            Xt = self._preprocess.transform(self._frame(rows))
+            if hasattr(Xt, "toarray"):
+                Xt = Xt.toarray()
+            Xt = np.ascontiguousarray(Xt, dtype=np.float32)
+        if self._numba is not None:
+            return self._numba(Xt)
+        if self._ort is not None:
+            return self._ort.run(None, {"input": Xt})[0]
+        if self._leaf is not None:
+            return self._leaf(Xt)
+        if Xt.shape[0] < self._SMALL_BATCH or self._reg_small is self._reg:
+            return self._reg_small.predict(Xt)
+        # joblib fans out across targets/trees; pin BLAS to one thread per worker so
+        # the two pools don't oversubscribe (OMP_NUM_THREADS is too late once loaded).
+        with threadpool_limits(limits=1, user_api="blas"):
+            return self._reg.predict(Xt)
+
     # ----- Input mapping -----
-    def _payload_to_df(self, payload: Mapping[str, Any]) -> pd.DataFrame:
+    def _inputs_used(self, values: np.ndarray) -> Dict[str, Any]:
+        """
+        Echo one (F,) object input row by column name, with NaN mapped to None in
+        one vectorized pass, so the dict serializes as ``null`` under any JSON
+        encoder (stdlib ``json``/``jsonify`` would otherwise emit a bare ``NaN``).
+        """
+        return dict(zip(self.expected_columns, np.where(pd.isna(values), None, values).tolist()))
+
+    def _payload_to_row(self, payload: Mapping[str, Any], out: np.ndarray, row_idx: int) -> None:
+        """
+        Write one payload's raw values into row ``row_idx`` of a preallocated object
+        array; ``_coerce_rows`` then converts the numeric block for all rows at once.
+        """
         body_weight = (
             payload.get("Body weight", None)
             or payload.get("Body_weight", None)
@@ -231,8 +935,8 @@ class PredictionModel:
         height = payload.get("Height", None) or payload.get("height", None)
 
         meal_bucket_raw = payload.get("meal_bucket", payload.get("meal_type", None))
-        meal_bucket = _bucket_meal_type(meal_bucket_raw)
-        gender = _normalize_gender(payload.get("Gender"))
+        meal_bucket = _bucket_meal_type("" if meal_bucket_raw is None else str(meal_bucket_raw))
+        gender = _normalize_gender(payload.get("Gender") or "")
 
         row: Dict[str, Any] = {
             "meal_bucket": meal_bucket,
@@ -253,18 +957,26 @@ class PredictionModel:
         if row["baseline_avg_glucose"] is None:
             raise ValueError("baseline_avg_glucose is required (mean mg/dL during −30..0 min pre-meal).")
 
-        row = {k: row.get(k, None) for k in self.expected_columns}
-        df = pd.DataFrame([row])
+        out[row_idx] = [row.get(c) for c in self.expected_columns]
 
-        for col in ["baseline_avg_glucose","meal_calories","carbs_g","protein_g","fat_g","fiber_g",
-                    "amount_consumed","Age","Body weight","Height","activity_cal_mean","mets_mean"]:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors="coerce")
+    def _coerce_rows(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Coerce the numeric block of a filled (N, F) row array in place, in one pass
+        over all rows instead of a pd.to_numeric per column per payload; returns the
+        (N,) baselines.
+        """
+        block = rows[:, self._num_idx]
+        nums = _coerce_numeric(block.ravel()).reshape(block.shape)
+        rows[:, self._num_idx] = nums
+        return nums[:, self._baseline_pos]
 
-        return df
+    def _payload_to_array(self, payload: Mapping[str, Any]) -> Tuple[np.ndarray, float]:
+        arr = np.empty((1, len(self.expected_columns)), dtype=object, order="C")
+        self._payload_to_row(payload, arr, 0)
+        return arr, float(self._coerce_rows(arr)[0])
 
     # ----- Core predict (single) -----
-    async def predict(self, payload: Any) -> Tuple[str, str, bool]: # json, png_path, b_is_safe
+    def predict(self, payload: Any) -> Tuple[str, str, bool]: # json, png_path, b_is_safe
         """
         Returns JSON string; also writes PNG/JSON to disk by default.
         JSON fields:
@@ -273,19 +985,26 @@ class PredictionModel:
           - json_path  (filesystem path of saved JSON) [if save_json=True]
           - png_base64 (optional, when return_plot==True)
           - csv, csv_base64, csv_filename (optional, when return_csv==True)
-        """
-        await asyncio.sleep(0)
 
+        With ``binary=True`` in the payload, the three curves are returned instead as
+        ``curves_b64``: base64 of a packed little-endian float32 array of shape
+        (3, 120) holding minutes, delta_glucose, absolute_glucose (``dtype``/``shape``
+        describe it). Saved JSON files always keep the plain arrays.
+
+        Synchronous and CPU-bound; async callers should use ``apredict``,
+        which runs it on a worker thread.
+        """
         if not isinstance(payload, Mapping):
             raise TypeError("payload must be a dict-like mapping")
 
         return_plot = bool(payload.get("return_plot", False))
         return_csv  = bool(payload.get("return_csv", False))
-        df = self._payload_to_df(payload)
+        binary      = bool(payload.get("binary", False))
+        row, baseline = self._payload_to_array(payload)
 
         # Predict Δglucose 1..120
         try:
-            yhat = self._model.predict(df)
+            yhat = self._predict_matrix(row)
             yhat = np.asarray(yhat).reshape(1, -1)
         except Exception as e:
             raise RuntimeError(f"Model prediction failed: {e}") from e
@@ -294,113 +1013,141 @@ class PredictionModel:
             raise RuntimeError(f"Model returned {yhat.shape[1]} outputs; expected 120.")
 
         y_delta = yhat[0].astype(float)
-        minutes = np.arange(1, 121, dtype=int)
-        baseline = float(df.loc[0, "baseline_avg_glucose"])
+        minutes = self._MINUTES
         y_abs = (baseline + y_delta).astype(float)
 
-        inputs_used = json.loads(df.iloc[0].to_json())
+        inputs_used = self._inputs_used(row[0])
         meal_name = inputs_used.get("meal_bucket", "meal")
         stamp = _ts()
 
         result: Dict[str, Any] = {
-            "minutes": minutes.tolist(),
-            "delta_glucose": y_delta.tolist(),
-            "absolute_glucose": y_abs.tolist(),
+            "minutes": minutes,
+            "delta_glucose": y_delta,
+            "absolute_glucose": y_abs,
             "inputs_used": inputs_used,
         }
 
+        png = self._render_png(minutes, y_abs, y_delta) if (self.save_plot or return_plot) else b""
+
         # Save PNG by default
         if self.save_plot:
             png_path = self.output_dir / f"{meal_name}_{stamp}.png"
-            _save_plot_png(png_path, minutes, y_abs, y_delta)
+            png_path.write_bytes(png)
             result["image_path"] = str(png_path.resolve())
 
         # Inline plot (base64) if requested
         if return_plot:
-            result["png_base64"] = _build_plot_base64(minutes, y_abs, y_delta)
+            result["png_base64"] = _b64.b64encode(png).decode("ascii")
 
         # Optional CSV in response (not saved unless you want to)
         if return_csv:
-            csv_text = _build_csv(df.iloc[0], minutes, y_delta, y_abs)
+            csv_text = _build_csv(inputs_used, minutes, y_delta, y_abs)
             result["csv"] = csv_text
-            result["csv_base64"] = base64.b64encode(csv_text.encode("utf-8")).decode("utf-8")
+            result["csv_base64"] = _b64.b64encode(csv_text.encode("utf-8")).decode("utf-8")
             result["csv_filename"] = f"glucose_curve_{meal_name}.csv"
 
         # Save JSON by default
         if self.save_json:
             json_path = self.output_dir / f"{meal_name}_{stamp}.json"
-            json_path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+            _write_json(json_path, result)
             result["json_path"] = str(json_path.resolve())
 
-        return json.dumps(result), str(result.get("image_path", "")), all([i < 240 for i in result["absolute_glucose"]])
+        if binary:
+            for key in ("minutes", "delta_glucose", "absolute_glucose"):
+                del result[key]
+            packed = np.stack([minutes, y_delta, y_abs]).astype("<f4")
+            result["curves_b64"] = _b64.b64encode(packed.tobytes()).decode("ascii")
+            result["dtype"] = "<f4"
+            result["shape"] = list(packed.shape)
+
+        return _dumps(result), str(result.get("image_path", "")), bool((y_abs < 240).all())
 
     # ----- Batch predict (vectorized & fast) -----
-    async def predict_many(self, payloads: List[Mapping[str, Any]]) -> str:
+    def predict_many(self, payloads: List[Mapping[str, Any]]) -> str:
         """
         Returns JSON string with {"items":[...]}.
         For each item, will save PNG/JSON to disk by default (image_path/json_path per item).
         """
-        await asyncio.sleep(0)
         if not isinstance(payloads, list):
             raise TypeError("payloads must be a list of dicts")
         if not payloads:
-            return json.dumps({"items": []})
-
-        dfs, baselines, plots, csv_flags = [], [], [], []
-        for p in payloads:
-            df = self._payload_to_df(p)
-            dfs.append(df)
-            baselines.append(float(df.loc[0, "baseline_avg_glucose"]))
+            return _dumps({"items": []})
+
+        # One (N, F) object array filled row by row, instead of N one-row frames + pd.concat.
+        # order="C" is deliberate: each sample's features sit together, which is how
+        # both the row fill here and the tree traversal walk the data.
+        n = len(payloads)
+        X_rows = np.empty((n, len(self.expected_columns)), dtype=object, order="C")
+        plots, csv_flags = [], []
+        for i, p in enumerate(payloads):
+            self._payload_to_row(p, X_rows, i)
             plots.append(bool(p.get("return_plot", False)))
             csv_flags.append(bool(p.get("return_csv", False)))
+        baselines = self._coerce_rows(X_rows)
 
-        X = pd.concat(dfs, axis=0, ignore_index=True)
         try:
-            Y = self._model.predict(X)
-            Y = np.asarray(Y, dtype=float)
+            Y = np.ascontiguousarray(self._predict_matrix(X_rows), dtype=np.float64)
         except Exception as e:
             raise RuntimeError(f"Batch prediction failed: {e}") from e
 
         if Y.shape[1] != 120:
             raise RuntimeError(f"Model returned {Y.shape[1]} outputs; expected 120.")
+        Y_abs = baselines[:, None] + Y
 
-        minutes = np.arange(1, 121, dtype=int)
-        items = []
+        minutes = self._MINUTES
         stamp_all = _ts()
 
-        for i, base in enumerate(baselines):
+        def _finalize(i: int) -> Dict[str, Any]:
             y_delta = Y[i]
-            y_abs = base + y_delta
-            inputs_used = json.loads(dfs[i].iloc[0].to_json())
+            y_abs = Y_abs[i]
+            inputs_used = self._inputs_used(X_rows[i])
             meal_name = inputs_used.get("meal_bucket", "meal")
             stamp = f"{stamp_all}_{i}"
 
             item = {
-                "minutes": minutes.tolist(),
-                "delta_glucose": y_delta.tolist(),
-                "absolute_glucose": y_abs.tolist(),
+                "minutes": minutes,
+                "delta_glucose": y_delta,
+                "absolute_glucose": y_abs,
                 "inputs_used": inputs_used,
             }
 
+            png = self._render_png(minutes, y_abs, y_delta) if (self.save_plot or plots[i]) else b""
+
             if self.save_plot:
                 png_path = self.output_dir / f"{meal_name}_{stamp}.png"
-                _save_plot_png(png_path, minutes, y_abs, y_delta)
+                png_path.write_bytes(png)
                 item["image_path"] = str(png_path.resolve())
 
             if plots[i]:
-                item["png_base64"] = _build_plot_base64(minutes, y_abs, y_delta)
+                item["png_base64"] = _b64.b64encode(png).decode("ascii")
 
             if csv_flags[i]:
-                csv_text = _build_csv(dfs[i].iloc[0], minutes, y_delta, y_abs)
+                csv_text = _build_csv(inputs_used, minutes, y_delta, y_abs)
                 item["csv"] = csv_text
-                item["csv_base64"] = base64.b64encode(csv_text.encode("utf-8")).decode("utf-8")
+                item["csv_base64"] = _b64.b64encode(csv_text.encode("utf-8")).decode("utf-8")
                 item["csv_filename"] = f"glucose_curve_{meal_name}_{i}.csv"
 
             if self.save_json:
                 json_path = self.output_dir / f"{meal_name}_{stamp}.json"
-                json_path.write_text(json.dumps(item, indent=2), encoding="utf-8")
+                _write_json(json_path, item)
                 item["json_path"] = str(json_path.resolve())
 
-            items.append(item)
+            return item
+
+        # Per-item rendering/serialization is independent; fan it out over the shared
+        # pool (each worker keeps its own cached Figure) and keep results in order.
+        if n > 1:
+            items = list(_finalize_pool.map(_finalize, range(n)))
+        else:
+            items = [_finalize(0)]
+
+        return _dumps({"items": items})
+
+    # ----- Async entry points -----
+    async def apredict(self, payload: Any) -> Tuple[str, str, bool]:
+        """``predict`` on a worker thread, so the event loop stays responsive."""
+        return await asyncio.to_thread(self.predict, payload)
 
-        return json.dumps({"items": items})
+    async def apredict_many(self, payloads: List[Mapping[str, Any]]) -> str:
+        """``predict_many`` on a worker thread, so the event loop stays responsive."""
+        return await asyncio.to_thread(self.predict_many, payloads)
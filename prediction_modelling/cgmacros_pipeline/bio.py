@@ -17,14 +17,20 @@ def _canon_pid(x) -> str | float:
     except Exception:
         return s
 
+def _canon_pid_col(col: pd.Series) -> pd.Series:
+    """_canon_pid over a column, evaluated once per distinct ID instead of once per row."""
+    codes, uniques = pd.factorize(col)  # missing values get code -1
+    canon = np.array([_canon_pid(u) for u in uniques] + [np.nan], dtype=object)
+    return pd.Series(canon[codes], index=col.index)
+
 def merge_segments_with_bio(segments_csv: Path, bio_csv: Path, out_csv: Path) -> Path:
     seg = pd.read_csv(segments_csv)
     bio = pd.read_csv(bio_csv)
 
     bio_id_col = next((c for c in CANDIDATE_ID_COLS if c in bio.columns), bio.columns[0])
 
-    seg["_pid"] = seg["patient_id"].apply(_canon_pid)
-    bio["_pid"] = bio[bio_id_col].apply(_canon_pid)
+    seg["_pid"] = _canon_pid_col(seg["patient_id"])
+    bio["_pid"] = _canon_pid_col(bio[bio_id_col])
 
     merged = seg.merge(bio.drop(columns=[bio_id_col]), on="_pid", how="left", suffixes=("", "_bio")).drop(columns=["_pid"])
     id_cols = ["timestamp","patient_id","meal_index","meal_timestamp","rel_minute"]
@@ -1,7 +1,6 @@
 from __future__ import annotations
 import argparse
 from pathlib import Path
-import pandas as pd
 
 from .segments import build_meal_segments_from_root
 from .bio import merge_segments_with_bio
@@ -15,6 +14,7 @@ def main():
     p1 = sub.add_parser("extract", help="Extract meal segments from CGMacros directory")
     p1.add_argument("--root", default=".", type=Path)
     p1.add_argument("--out", default=Path("all_users_all_meal_segments.csv"), type=Path)
+    p1.add_argument("--cache-dir", default=None, type=Path, help="Reuse parsed CSVs as Parquet in this directory")
 
     p2 = sub.add_parser("merge-bio", help="Merge segments with bio.csv")
     p2.add_argument("--segments", default=Path("all_users_all_meal_segments.csv"), type=Path)
@@ -34,12 +34,12 @@ def main():
     p5.add_argument("--root", default=".", type=Path)
     p5.add_argument("--bio", default=Path("bio.csv"), type=Path)
     p5.add_argument("--workdir", default=Path("."), type=Path)
+    p5.add_argument("--cache-dir", default=None, type=Path, help="Reuse parsed CSVs as Parquet in this directory")
 
     args = ap.parse_args()
 
     if args.cmd == "extract":
-        segs = build_meal_segments_from_root(str(args.root))
-        combined = pd.concat(segs, ignore_index=True) if segs else pd.DataFrame()
+        combined = build_meal_segments_from_root(str(args.root), cache_dir=args.cache_dir)
         combined.to_csv(args.out, index=False)
         print(f"Wrote {args.out} with {len(combined)} rows")
     elif args.cmd == "merge-bio":
@@ -54,8 +54,7 @@ def main():
     elif args.cmd == "pipeline":
         work = args.workdir
         seg_csv = work / "all_users_all_meal_segments.csv"
-        segs = build_meal_segments_from_root(str(args.root))
-        pd.concat(segs, ignore_index=True).to_csv(seg_csv, index=False)
+        build_meal_segments_from_root(str(args.root), cache_dir=args.cache_dir).to_csv(seg_csv, index=False)
 
         merged_csv = work / "all_meal_segments_with_bio.csv"
         merge_segments_with_bio(seg_csv, args.bio, merged_csv)
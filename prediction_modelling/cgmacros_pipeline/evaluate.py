@@ -16,7 +16,7 @@ def eval_with_nulls(all_segments_with_bio_csv: Path, model_pkl: Path, out_dir: P
     X_df, Y = build_meal_level_dataset(df)
     X_tr, X_te, Y_tr, Y_te = train_test_split(X_df, Y, test_size=test_size, random_state=random_state)
 
-    model = joblib.load(model_pkl)
+    model = joblib.load(model_pkl, mmap_mode="r")
     Y_hat = model.predict(X_te)
     mse_test = mean_squared_error(Y_te, Y_hat)
 
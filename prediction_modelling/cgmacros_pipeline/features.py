@@ -2,7 +2,6 @@ from __future__ import annotations
 from typing import Tuple, Dict, Any
 import numpy as np
 import pandas as pd
-from tqdm.auto import tqdm
 
 # Build meal-level feature table + 120-d target vector
 # Adapted from training/eval scripts  
@@ -29,56 +28,50 @@ def build_meal_level_dataset(df: pd.DataFrame, verbose: bool=False) -> tuple[pd.
     df["patient_id"] = df["patient_id"].astype(str)
 
     keys = ["patient_id","meal_index","meal_timestamp","meal_bucket"]
-    meals = df.dropna(subset=["meal_bucket"]).groupby(keys, as_index=False)
+    # Stable sort by minute so groupby.first() picks the earliest non-null value per meal.
+    meals = df.dropna(subset=["meal_bucket"]).sort_values("rel_minute", kind="mergesort")
+    rel, glucose = meals["rel_minute"], meals["glucose_mgdl"]
 
-    rows, ys = [], []
-    n_skipped_base = n_skipped_post = 0
+    # Baseline: mean glucose over -30..-1 min, falling back to -60..-1 min.
+    pre = meals[keys].assign(
+        base30=glucose.where((rel >= -30) & (rel < 0)),
+        base60=glucose.where((rel >= -60) & (rel < 0)),
+    ).groupby(keys).mean()
+    baseline = pre["base30"].fillna(pre["base60"])
+    has_base = baseline.notna()
+    n_skipped_base = int((~has_base).sum())
 
-    for key, g in tqdm(meals, total=meals.ngroups, desc="Meals"):
-        g = g.sort_values("rel_minute")
-        base = g[(g["rel_minute"] >= -30) & (g["rel_minute"] < 0)]["glucose_mgdl"].dropna()
-        if not len(base):
-            pre = g[(g["rel_minute"] >= -60) & (g["rel_minute"] < 0)]["glucose_mgdl"].dropna()
-            if not len(pre):
-                n_skipped_base += 1
-                continue
-            baseline = float(pre.mean())
-        else:
-            baseline = float(base.mean())
+    # Targets: one (meals x 120) matrix, gaps interpolated in a single pass.
+    post = meals[(rel >= 1) & (rel <= 120)].dropna(subset=["rel_minute","delta_glucose_mgdl"])
+    curves = (
+        post.groupby(keys + ["rel_minute"])["delta_glucose_mgdl"].first()
+        .unstack("rel_minute")
+        .reindex(index=baseline.index[has_base], columns=np.arange(1, 121, dtype=float))
+        .interpolate(axis=1, limit_direction="both")
+    )
+    complete = curves.notna().all(axis=1).to_numpy()
+    n_skipped_post = int((~complete).sum())
+    idx = curves.index[complete]
 
-        post = g[(g["rel_minute"] >= 1) & (g["rel_minute"] <= 120)][["rel_minute","delta_glucose_mgdl"]].dropna()
-        idx = pd.Index(range(1,121), name="rel_minute")
-        post = post.set_index("rel_minute").reindex(idx)
-        post["delta_glucose_mgdl"] = post["delta_glucose_mgdl"].interpolate(limit_direction="both")
-        y_vec = post["delta_glucose_mgdl"].values.astype(float)
-        if np.isnan(y_vec).any():
-            n_skipped_post += 1
-            continue
+    g = meals.groupby(keys)
+    first_cols = ["meal_calories","carbs_g","protein_g","fat_g","fiber_g","amount_consumed","Age","Body weight","Height"]
+    firsts = g[[c for c in first_cols if c in meals] + ["Gender"]].first().reindex(idx)
+    means = g[["activity_cal","mets"]].mean().reindex(idx)
+    gender = firsts["Gender"]
 
-        def first(col: str):
-            return float(g[col].dropna().iloc[0]) if col in g and g[col].notna().any() else np.nan
-
-        rows.append({
-            "patient_id": str(key[0]),
-            "meal_bucket": key[3],
-            "baseline_avg_glucose": baseline,
-            "meal_calories": first("meal_calories"),
-            "carbs_g": first("carbs_g"),
-            "protein_g": first("protein_g"),
-            "fat_g": first("fat_g"),
-            "fiber_g": first("fiber_g"),
-            "amount_consumed": first("amount_consumed"),
-            "Age": first("Age"),
-            "Gender": str(g["Gender"].dropna().iloc[0]) if g["Gender"].notna().any() else "Unknown",
-            "Body weight": first("Body weight"),
-            "Height": first("Height"),
-            "activity_cal_mean": float(g["activity_cal"].mean()) if g["activity_cal"].notna().any() else np.nan,
-            "mets_mean": float(g["mets"].mean()) if g["mets"].notna().any() else np.nan,
-        })
-        ys.append(y_vec)
-
-    X = pd.DataFrame.from_records(rows)
-    Y = np.vstack(ys) if ys else np.empty((0,120))
+    X = pd.DataFrame({
+        "patient_id": idx.get_level_values("patient_id").astype(str),
+        "meal_bucket": idx.get_level_values("meal_bucket"),
+        "baseline_avg_glucose": baseline.reindex(idx).to_numpy(dtype=float),
+        **{c: (firsts[c].to_numpy(dtype=float) if c in firsts else np.full(len(idx), np.nan))
+           for c in first_cols[:7]},
+        "Gender": np.where(gender.notna(), gender.astype(str), "Unknown"),
+        **{c: (firsts[c].to_numpy(dtype=float) if c in firsts else np.full(len(idx), np.nan))
+           for c in first_cols[7:]},
+        "activity_cal_mean": means["activity_cal"].to_numpy(dtype=float),
+        "mets_mean": means["mets"].to_numpy(dtype=float),
+    })
+    Y = curves.to_numpy(dtype=float)[complete]
     if verbose:
         print(f"Features: {X.shape}  Target: {Y.shape}  Skipped baseline={n_skipped_base}, post={n_skipped_post}")
     return X, Y
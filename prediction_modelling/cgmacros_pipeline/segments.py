@@ -1,15 +1,34 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import re
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 
 # ——— Helpers adapted from your meal_segments.py ———
 # (normalize, detect_meals, extract_meal_segment, build_... functions)
 # Source: meal_segments.py  :contentReference[oaicite:6]{index=6}
 
+_TIMESTAMP_COLS = ("Timestamp", "timestamp", "Time", "time", "DateTime", "datetime")
+# Everything _normalize reads; the rest of a CGMacros export (HR, image paths, ...) is never parsed.
+_CSV_COLS = frozenset(_TIMESTAMP_COLS + (
+    "Dexcom GL", "Libre GL", "Calories (Activity)", "METs",
+    "Meal Type", "Calories", "Carbs", "Protein", "Fat", "Fiber", "Amount Consumed",
+))
+
+_PID_RE = re.compile(r"CGMacros-(.+)$")
+
+_SIGNAL_COLS = ["glucose_mgdl","activity_cal","mets"]
+_MEAL_COLS = ["meal_type","meal_calories","carbs_g","protein_g","fat_g","fiber_g","amount_consumed"]
+_NUMERIC_COLS = _SIGNAL_COLS + _MEAL_COLS[1:]
+_SEGMENT_COLS = [
+    "timestamp","patient_id","meal_index","meal_timestamp","rel_minute",
+    "glucose_mgdl","delta_glucose_mgdl","activity_cal","mets",
+    *_MEAL_COLS,
+]
+
 def _choose_glucose_column(df: pd.DataFrame) -> str:
     for col in ("Dexcom GL", "Libre GL"):
         if col in df.columns and df[col].notna().sum() > 0:
@@ -17,11 +36,35 @@ def _choose_glucose_column(df: pd.DataFrame) -> str:
     raise ValueError("No glucose column found among: 'Dexcom GL', 'Libre GL'.")
 
 def _find_timestamp_column(df: pd.DataFrame) -> str:
-    for c in ("Timestamp", "timestamp", "Time", "time", "DateTime", "datetime"):
+    for c in _TIMESTAMP_COLS:
         if c in df.columns:
             return c
     raise ValueError("No timestamp-like column found.")
 
+def _read_patient_csv(csv_path: str, cache_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    Parsed CGMacros CSV. With ``cache_dir``, a ``<stem>.parquet`` copy is written there
+    on first read and used for as long as it is newer than the CSV; the dataset
+    directory itself is never written to. If pyarrow is missing or ``cache_dir``
+    isn't writable, the CSV is simply parsed each time.
+    """
+    path = Path(csv_path)
+    cached = Path(cache_dir) / f"{path.stem}.parquet" if cache_dir else None
+    if cached is not None:
+        try:
+            if cached.exists() and cached.stat().st_mtime >= path.stat().st_mtime:
+                return pd.read_parquet(cached)
+        except Exception:
+            pass  # unreadable/foreign cache: re-parse and overwrite it
+    raw = pd.read_csv(path, usecols=lambda c: c in _CSV_COLS, engine="c")
+    if cached is not None:
+        try:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            raw.to_parquet(cached, compression="zstd", index=False)
+        except Exception:
+            cached.unlink(missing_ok=True)
+    return raw
+
 def _normalize(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
     ts_col = _find_timestamp_column(df)
@@ -41,31 +84,23 @@ def _normalize(df: pd.DataFrame) -> pd.DataFrame:
     df["fat_g"] = pd.to_numeric(df.get("Fat", np.nan), errors="coerce")
     df["fiber_g"] = pd.to_numeric(df.get("Fiber", np.nan), errors="coerce")
     df["amount_consumed"] = pd.to_numeric(df.get("Amount Consumed", np.nan), errors="coerce")
+
+    # float32 is ample for mg/dL and grams, and halves what resample/interpolate touch.
+    df[_NUMERIC_COLS] = df[_NUMERIC_COLS].astype(np.float32)
+    if "Meal Type" in df.columns:
+        df["meal_type"] = df["meal_type"].astype("category")
     return df.set_index("Timestamp", drop=True)
 
-def detect_meals(df: pd.DataFrame) -> pd.DataFrame:
-    meal_mask = (
-        df["meal_type"].notna()
-        | df["meal_calories"].notna()
-        | df["carbs_g"].notna()
-        | df["protein_g"].notna()
-        | df["fat_g"].notna()
-        | df["fiber_g"].notna()
-        | df["amount_consumed"].notna()
-    )
-    return df.loc[meal_mask].copy()
-
-def _nearest_meal_row(df: pd.DataFrame, meal_time: pd.Timestamp) -> pd.Series:
-    try:
-        cols = ["meal_type","meal_calories","carbs_g","protein_g","fat_g","fiber_g","amount_consumed"]
-        return df.loc[meal_time, cols]
-    except KeyError:
-        take = df.index.get_indexer([meal_time], method="nearest")
-        idx = take[0]
-        nearest = df.index[idx]
-        if abs((nearest - meal_time).total_seconds()) <= 120:
-            return df.loc[nearest, cols]
-        return pd.Series({c: np.nan for c in cols})
+def detect_meal_times(df: pd.DataFrame) -> Tuple[np.ndarray, pd.DataFrame]:
+    """
+    Meal times (datetime64 array) and the matching rows of meal columns; row ``i``
+    of the frame belongs to ``times[i]`` and is indexed by its row position in
+    ``df``, so no per-meal label lookup is needed.
+    """
+    meal_mask = df[_MEAL_COLS].notna().any(axis=1).to_numpy()
+    positions = np.flatnonzero(meal_mask)
+    meta = df.iloc[positions, [df.columns.get_loc(c) for c in _MEAL_COLS]]
+    return df.index.values[positions], meta.set_axis(positions, axis=0)
 
 def extract_meal_segment(
     df: pd.DataFrame,
@@ -76,18 +111,25 @@ def extract_meal_segment(
     resample_rule: str = "1min",
     meal_index: int = 0,
     patient_id: str = "unknown",
+    meal_position: Optional[int] = None,
 ) -> pd.DataFrame:
+    """
+    One meal's segment. ``meal_position`` is the meal's row in ``df`` (as found by
+    ``detect_meal_times``); without it the meal columns come from the nearest row,
+    if that is within two minutes of ``meal_time``.
+    """
     start = meal_time - pd.Timedelta(minutes=pre_minutes)
     end = meal_time + pd.Timedelta(minutes=post_minutes)
-    cols = ["glucose_mgdl","activity_cal","mets"]
-    seg = df.loc[start:end, cols].copy()
+    # Positional window on the sorted index; iloc with column positions already copies.
+    lo, hi = df.index.searchsorted(start, side="left"), df.index.searchsorted(end, side="right")
+    seg = df.iloc[lo:hi, [df.columns.get_loc(c) for c in _SIGNAL_COLS]]
     if seg.empty:
         return pd.DataFrame()
 
     if resample_rule:
         seg = seg.resample(resample_rule).mean().interpolate(limit_direction="both")
 
-    seg["rel_minute"] = ((seg.index - meal_time).total_seconds() / 60.0).astype(int)
+    seg["rel_minute"] = ((seg.index - meal_time).total_seconds() / 60.0).astype(np.int16)
 
     m = (seg["rel_minute"] >= -baseline_window) & (seg["rel_minute"] < 0)
     if m.any() and seg.loc[m, "glucose_mgdl"].notna().any():
@@ -97,11 +139,18 @@ def extract_meal_segment(
 
     seg["delta_glucose_mgdl"] = seg["glucose_mgdl"] - baseline
 
-    meta = _nearest_meal_row(df, meal_time)
+    if meal_position is None:
+        meal_position = int(df.index.get_indexer([meal_time], method="nearest")[0])
+        if abs(df.index[meal_position] - meal_time) > pd.Timedelta(minutes=2):
+            meal_position = None
+    if meal_position is None:
+        meta = pd.Series(dtype=object)
+    else:
+        meta = df.iloc[meal_position, [df.columns.get_loc(c) for c in _MEAL_COLS]]
     seg["meal_timestamp"] = meal_time
     seg["meal_index"] = meal_index
     seg["patient_id"] = patient_id
-    for c in ["meal_type","meal_calories","carbs_g","protein_g","fat_g","fiber_g","amount_consumed"]:
+    for c in _MEAL_COLS:
         seg[c] = meta.get(c, np.nan)
 
     seg = seg.reset_index().rename(columns={"index": "timestamp", "Timestamp": "timestamp"})
@@ -111,6 +160,98 @@ def extract_meal_segment(
         "meal_type","meal_calories","carbs_g","protein_g","fat_g","fiber_g","amount_consumed"
     ]]
 
+def _segments_on_grid(
+    df: pd.DataFrame,
+    meal_times: np.ndarray,
+    meal_meta: pd.DataFrame,
+    pre_minutes: int,
+    post_minutes: int,
+    baseline_window: int,
+    resample_rule: str,
+    patient_id: str,
+) -> pd.DataFrame:
+    """
+    All of one patient's meal segments as a single frame. The signal columns are
+    resampled and interpolated once over the whole series; each meal is then an
+    integer slice of that grid instead of its own .loc + resample + interpolate.
+    Slices span the bins of the first..last reading inside the window, and values
+    outside a column's first..last valid bin in the window are held flat, which is
+    what interpolating each segment on its own gave.
+    """
+    resampler = df[_SIGNAL_COLS].resample(resample_rule)
+    binned = resampler.mean()
+    t = binned.index.values
+    filled = binned.interpolate(limit_direction="both").to_numpy(dtype=np.float32)
+    has_value = binned.notna().to_numpy()
+    step = pd.Timedelta(resample_rule).to_timedelta64()
+
+    # First/last raw reading in [meal - pre, meal + post] -> the bins holding them.
+    ts = df.index.values
+    mt = meal_times
+    r0 = np.searchsorted(ts, mt - np.timedelta64(pre_minutes, "m"), side="left")
+    r1 = np.searchsorted(ts, mt + np.timedelta64(post_minutes, "m"), side="right")
+    keep = r1 > r0
+    meal_index = np.flatnonzero(keep)
+    r0, r1, mt = r0[keep], r1[keep], mt[keep]
+    if not len(meal_index):
+        return pd.DataFrame(columns=_SEGMENT_COLS)
+    # The grid is regular from t[0], so a reading's bin is plain integer arithmetic.
+    lo = (ts[r0] - t[0]) // step
+    hi = (ts[r1 - 1] - t[0]) // step + 1
+
+    lens = hi - lo
+    seg_of_row = np.repeat(np.arange(len(lens)), lens)
+    rows = np.arange(lens.sum()) - np.repeat(np.cumsum(lens) - lens, lens) + lo[seg_of_row]
+    rel = ((t[rows] - mt[seg_of_row]) / np.timedelta64(1, "m")).astype(np.int16)
+
+    sig = np.full((len(rows), len(_SIGNAL_COLS)), np.nan, dtype=np.float32)
+    for j in reversed(range(len(_SIGNAL_COLS))):  # glucose last: its bounds are reused below
+        valid = np.flatnonzero(has_value[:, j])
+        if not len(valid):
+            continue
+        first = valid[np.minimum(np.searchsorted(valid, lo), len(valid) - 1)]
+        last = valid[np.maximum(np.searchsorted(valid, hi) - 1, 0)]
+        ok = (first >= lo) & (first < hi)  # the column has a reading inside this segment
+        src = np.clip(rows, first[seg_of_row], last[seg_of_row])
+        sig[:, j] = np.where(ok[seg_of_row], filled[src, j], np.nan)
+
+    # Baseline: median over rel in [-baseline_window, 0), i.e. the bins in
+    # (meal - (window+1) min, meal - 1 min]. One rolling median over the grid covers
+    # every meal whose window is full and between in-segment glucose readings.
+    baseline = np.full(len(lens), np.nan, dtype=np.float32)
+    regular = np.zeros(len(lens), dtype=bool)
+    if baseline_window > 0 and has_value[:, 0].any():
+        wlo = np.searchsorted(t, mt - np.timedelta64(baseline_window + 1, "m"), side="right")
+        whi = np.searchsorted(t, mt - np.timedelta64(1, "m"), side="right")
+        regular = (ok & (whi - wlo == baseline_window)
+                   & (wlo >= np.maximum(lo, first)) & (whi <= np.minimum(hi, last + 1)))
+        rolled = pd.Series(filled[:, 0]).rolling(baseline_window).median().to_numpy()
+        baseline[regular] = rolled[whi[regular] - 1]
+    if not regular.all():
+        # Clipped/partial windows: median of what's there, else the first reading.
+        sub = ~regular[seg_of_row]
+        glucose = pd.Series(sig[sub, 0])
+        in_base = (rel[sub] >= -baseline_window) & (rel[sub] < 0)
+        med = glucose.where(in_base).groupby(seg_of_row[sub]).median()
+        med = med.fillna(glucose.groupby(seg_of_row[sub]).first())
+        baseline[med.index.to_numpy()] = med.to_numpy()
+
+    meta = meal_meta.iloc[meal_index]
+    out = pd.DataFrame({
+        "timestamp": t[rows],
+        "patient_id": patient_id,
+        "meal_index": meal_index[seg_of_row],
+        "meal_timestamp": mt[seg_of_row],
+        "rel_minute": rel,
+        "glucose_mgdl": sig[:, 0],
+        "delta_glucose_mgdl": sig[:, 0] - baseline[seg_of_row],
+        "activity_cal": sig[:, 1],
+        "mets": sig[:, 2],
+    })
+    for c in _MEAL_COLS:
+        out[c] = meta[c].to_numpy()[seg_of_row]
+    return out
+
 def build_meal_segments_from_csv(
     csv_path: str,
     patient_id: Optional[str] = None,
@@ -118,22 +259,27 @@ def build_meal_segments_from_csv(
     post_minutes: int = 120,
     baseline_window: int = 15,
     resample_rule: str = "1min",
-) -> List[pd.DataFrame]:
-    raw = pd.read_csv(csv_path)
+    cache_dir: Optional[str] = None,
+) -> pd.DataFrame:
+    """One patient's meal segments as a single frame (``meal_index`` keys each meal)."""
+    raw = _read_patient_csv(csv_path, cache_dir)
     df = _normalize(raw)
-    meals = detect_meals(df)
+    meal_times, meal_meta = detect_meal_times(df)
     if patient_id is None:
         stem = Path(csv_path).stem
-        m = re.search(r"CGMacros-(.+)$", stem)
+        m = _PID_RE.search(stem)
         patient_id = m.group(1) if m else stem
+    if resample_rule:
+        return _segments_on_grid(df, meal_times, meal_meta, pre_minutes, post_minutes,
+                                 baseline_window, resample_rule, patient_id)
     out: List[pd.DataFrame] = []
-    for i, meal_time in enumerate(meals.index):
-        seg = extract_meal_segment(df, meal_time,
+    for i, (meal_time, pos) in enumerate(zip(meal_times, meal_meta.index)):
+        seg = extract_meal_segment(df, pd.Timestamp(meal_time),
                                    pre_minutes, post_minutes, baseline_window, resample_rule,
-                                   i, patient_id)
+                                   i, patient_id, meal_position=pos)
         if not seg.empty:
             out.append(seg)
-    return out
+    return pd.concat(out, ignore_index=True) if out else pd.DataFrame(columns=_SEGMENT_COLS)
 
 def build_meal_segments_from_root(
     root_dir: str = ".",
@@ -141,11 +287,14 @@ def build_meal_segments_from_root(
     post_minutes: int = 120,
     baseline_window: int = 15,
     resample_rule: str = "1min",
-) -> List[pd.DataFrame]:
+    cache_dir: Optional[str] = None,
+    n_jobs: int = -1,
+) -> pd.DataFrame:
+    """Every patient's meal segments under ``root_dir/CGMacros`` as one frame."""
     base = Path(root_dir) / "CGMacros"
-    out: List[pd.DataFrame] = []
     if not base.exists():
-        return out
+        return pd.DataFrame(columns=_SEGMENT_COLS)
+    patients = []
     for folder in sorted(base.glob("CGMacros-*")):
         if not folder.is_dir(): 
             continue
@@ -153,7 +302,14 @@ def build_meal_segments_from_root(
         csv_path = folder / f"CGMacros-{pid}.csv"
         if not csv_path.exists():
             continue
-        out.extend(build_meal_segments_from_csv(str(csv_path), patient_id=pid,
-                                                pre_minutes=pre_minutes, post_minutes=post_minutes,
-                                                baseline_window=baseline_window, resample_rule=resample_rule))
-    return out
+        patients.append((str(csv_path), pid))
+    # Patients are independent; each worker reads and segments its own CSV.
+    per_patient = Parallel(n_jobs=n_jobs, backend="loky", batch_size=1)(
+        delayed(build_meal_segments_from_csv)(csv_path, patient_id=pid,
+                                              pre_minutes=pre_minutes, post_minutes=post_minutes,
+                                              baseline_window=baseline_window, resample_rule=resample_rule,
+                                              cache_dir=cache_dir)
+        for csv_path, pid in patients
+    )
+    frames = [f for f in per_patient if not f.empty]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=_SEGMENT_COLS)
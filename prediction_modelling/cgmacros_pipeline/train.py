@@ -1,6 +1,7 @@
 from __future__ import annotations
 from pathlib import Path
 from typing import Tuple, Dict
+import os
 import time
 import numpy as np
 import pandas as pd
@@ -32,7 +33,7 @@ def train_random_forest(
     max_depth: int | None = 14,
     min_samples_split: int = 6,
     min_samples_leaf: int = 3,
-    n_jobs: int = -1,
+    n_jobs: int | None = None,
 ) -> Dict[str, float | str]:
     """
     Train a single multi-output RandomForestRegressor to predict Δglucose at minutes 1..120.
@@ -48,12 +49,15 @@ def train_random_forest(
     random_state : int
         Random seed for reproducibility.
     n_estimators, max_depth, min_samples_split, min_samples_leaf, n_jobs
-        Random forest hyperparameters.
+        Random forest hyperparameters. ``n_jobs=None`` sizes the thread pool by tree
+        count (one thread per 32 trees, capped at the CPU count) instead of -1, so
+        small forests don't pay for threads they can't use.
 
     Returns
     -------
     dict
-        {"train_mse": float, "test_mse": float, "train_seconds": float, "model_path": str}
+        {"train_mse": float, "test_mse": float, "train_seconds": float,
+         "model_path": str, "archive_path": str}
     """
     out_dir.mkdir(parents=True, exist_ok=True)
     df = pd.read_csv(all_segments_with_bio_csv)
@@ -73,7 +77,7 @@ def train_random_forest(
                 Pipeline(
                     steps=[
                         ("imp", SimpleImputer(strategy="most_frequent")),
-                        ("oh", OneHotEncoder(handle_unknown="ignore")),
+                        ("oh", OneHotEncoder(handle_unknown="ignore", sparse_output=False, dtype=np.float32)),
                     ]
                 ),
                 CATEGORICAL,
@@ -81,6 +85,9 @@ def train_random_forest(
         ]
     )
 
+    if n_jobs is None:
+        n_jobs = min(os.cpu_count() or 1, max(1, n_estimators // 32))
+
     # Single RF that natively handles multi-output regression (Y is 2D)
     rf = RandomForestRegressor(
         n_estimators=n_estimators,
@@ -91,15 +98,23 @@ def train_random_forest(
         n_jobs=n_jobs,
     )
 
-    model = Pipeline([("preprocess", preprocess), ("reg", rf)])
-
+    # Fit the forest on a C-contiguous float32 matrix: the tree builder works in
+    # float32, so handing it float64 through the Pipeline costs an extra copy.
+    # Y stays float64, which is what the builder stores targets as.
     t0 = time.perf_counter()
-    model.fit(X_tr, Y_tr)
+    Xt_tr = np.ascontiguousarray(preprocess.fit_transform(X_tr), dtype=np.float32)
+    rf.fit(Xt_tr, Y_tr)
     t1 = time.perf_counter()
 
-    # Evaluate
-    Y_tr_pred = model.predict(X_tr)
-    Y_te_pred = model.predict(X_te)
+    # Evaluate on the already-transformed matrices rather than through the
+    # Pipeline, which would re-run the ColumnTransformer for each predict.
+    # Single-threaded: per-tree predict work is too small to amortize the
+    # thread pool. The fitted n_jobs is restored so the saved model keeps it.
+    Xt_te = np.ascontiguousarray(preprocess.transform(X_te), dtype=np.float32)
+    rf.n_jobs = 1
+    Y_tr_pred = rf.predict(Xt_tr)
+    Y_te_pred = rf.predict(Xt_te)
+    rf.n_jobs = n_jobs
     mse_tr = mean_squared_error(Y_tr, Y_tr_pred)
     mse_te = mean_squared_error(Y_te, Y_te_pred)
 
@@ -109,25 +124,30 @@ def train_random_forest(
     ).to_csv(out_dir / "summary.csv", index=False)
 
     # Export feature importances (using fitted one-hot names)
-    preprocess_fitted = model.named_steps["preprocess"]
-    oh: OneHotEncoder = preprocess_fitted.named_transformers_["cat"].named_steps["oh"]
-    num_cols = preprocess_fitted.transformers_[0][2]
+    oh: OneHotEncoder = preprocess.named_transformers_["cat"].named_steps["oh"]
+    num_cols = preprocess.transformers_[0][2]
     cat_cols = oh.get_feature_names_out(CATEGORICAL).tolist()
     all_feature_names = list(num_cols) + cat_cols
 
-    rf_fitted: RandomForestRegressor = model.named_steps["reg"]
-    fi = rf_fitted.feature_importances_
+    fi = rf.feature_importances_
     pd.DataFrame({"feature": all_feature_names, "importance": fi}).sort_values(
         "importance", ascending=False
     ).to_csv(out_dir / "feature_importances.csv", index=False)
 
-    # Save model (compressed)
+    # The fitted steps are only assembled into a Pipeline for the saved artifact.
+    model = Pipeline([("preprocess", preprocess), ("reg", rf)])
+
+    # Serving copy is uncompressed so loaders can mmap the forest's arrays
+    # (joblib.load(..., mmap_mode="r")); the xz copy is for archival.
     model_path = out_dir / "model_multioutput.pkl"
-    joblib.dump(model, model_path, compress=("xz", 3))
+    joblib.dump(model, model_path, compress=0)
+    archive_path = model_path.with_suffix(".pkl.xz")
+    joblib.dump(model, archive_path, compress=("xz", 3))
 
     return {
         "train_mse": float(mse_tr),
         "test_mse": float(mse_te),
         "train_seconds": float(t1 - t0),
         "model_path": str(model_path),
+        "archive_path": str(archive_path),
     }
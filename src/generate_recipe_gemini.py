@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import os
-from typing import Any, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
 
 from llm_module import LLMRequestContext, create_client
+from llm_module.utils import json_dumps_indented, json_loads
 from recipe_creator import (
     NUTRITION_SCHEMA,
     RECIPE_SCHEMA,
@@ -19,10 +22,12 @@ RECIPE_SYSTEM_PROMPT = SYSTEM_PROMPT
 NUTRITION_SYSTEM_PROMPT = SYSTEM_PROMPT
 
 
+@functools.cache
 def _select_model() -> str:
     return os.environ.get("GEMINI_MODEL", "models/gemini-1.5-flash")
 
 
+@functools.cache
 def _get_api_key() -> str:
     api_key = os.environ.get("GEMINI_API_KEY")
     if not api_key:
@@ -45,13 +50,13 @@ def _request_recipe(client, ingredient: str) -> Dict[str, Any]:
     )
 
     try:
-        return json.loads(raw)
+        return json_loads(raw)
     except json.JSONDecodeError as exc:
         raise ValueError(f"Gemini response was not valid JSON: {raw}") from exc
 
 
 def _build_nutrition_prompt(recipe_payload: Dict[str, Any]) -> str:
-    recipe_json = json.dumps(recipe_payload, indent=2)
+    recipe_json = json_dumps_indented(recipe_payload)
     return (
         "Review the following low-GI recipe JSON and estimate total meal macros.\n"
         "Focus on realistic, moderate portions that support stable blood sugar.\n"
@@ -75,32 +80,64 @@ def _request_nutrition(client, recipe_payload: Dict[str, Any]) -> Dict[str, Any]
     )
 
     try:
-        return json.loads(raw)
+        return json_loads(raw)
     except json.JSONDecodeError as exc:
         raise ValueError(f"Gemini nutrition response was not valid JSON: {raw}") from exc
 
 
-def main(ingredient: str = "salmon") -> None:
-    api_key = _get_api_key()
-    client = create_client(
+def _create_client():
+    return create_client(
         "gemini",
         parser=None,
-        api_key=api_key,
+        api_key=_get_api_key(),
         default_generation_config={"temperature": 0.6},
     )
 
+
+def _generate(client, ingredient: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     recipe_payload = _request_recipe(client, ingredient)
-    nutrition_payload = _request_nutrition(client, recipe_payload)
+    return recipe_payload, _request_nutrition(client, recipe_payload)
+
 
+def _print_payloads(recipe_payload: Dict[str, Any], nutrition_payload: Dict[str, Any]) -> None:
     print("Recipe JSON:\n")
-    print(json.dumps(recipe_payload, indent=2))
+    print(json_dumps_indented(recipe_payload))
     print("\nNutrition JSON:\n")
-    print(json.dumps(nutrition_payload, indent=2))
+    print(json_dumps_indented(nutrition_payload))
+
+
+def main(ingredient: str = "salmon") -> None:
+    _print_payloads(*_generate(_create_client(), ingredient))
+
+
+def main_batch(
+    ingredients: List[str], max_workers: int = 8
+) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Generate recipe and nutrition payloads for several ingredients at once.
+
+    The nutrition call needs the recipe, so each ingredient stays a two-step
+    chain; the chains themselves run concurrently to overlap network latency.
+    Results are returned (and printed) in input order.
+    """
+
+    client = _create_client()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(ingredients)))) as pool:
+        futures = [pool.submit(_generate, client, ingredient) for ingredient in ingredients]
+        results = [future.result() for future in futures]
+
+    for ingredient, (recipe_payload, nutrition_payload) in zip(ingredients, results):
+        print(f"=== {ingredient} ===\n")
+        _print_payloads(recipe_payload, nutrition_payload)
+        print()
+    return results
 
 
 if __name__ == "__main__":
     import sys
 
-    ingredient = sys.argv[1] if len(sys.argv) > 1 else "salmon"
-    main(ingredient)
+    if len(sys.argv) > 2:
+        main_batch(sys.argv[1:])
+    else:
+        ingredient = sys.argv[1] if len(sys.argv) > 1 else "salmon"
+        main(ingredient)
 
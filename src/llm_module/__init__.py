@@ -2,45 +2,63 @@
 
 from __future__ import annotations
 
-from typing import Optional
-
-from .clients import LLMClientBase, StructuredResponseParser, default_parser
-from .models import (
-    ConversationPrompts,
-    FoodAnalysisResponse,
-    FoodAnalysisResult,
-    FoodIngredient,
-    FoodPortionAnalysis,
-    HealthInfo,
-    HealthInfoRepository,
-    LLMRequestContext,
-    QuestionEvaluation,
-    MealIntent,
-    Recipe,
-    RecipeIngredient,
-    UserContext,
-)
-from .question_bank import (
-    HEALTH_FIELD_MAPPING,
-    HEALTH_QUESTION_ORDER,
-    HEALTH_REQUIRED_RETRY_MESSAGES,
-    MEAL_QUESTION_KEYS,
-    QUESTION_SPECS,
-    QUESTION_SPEC_BY_KEY,
-    REQUIRED_HEALTH_KEYS,
-)
-from .responses import (
-    LLM_STUDIO_RESPONSE_SCHEMA,
-    build_system_prompt,
-    build_user_prompt,
-)
-from .workflow import (
-    HealthSessionManager,
-    LLMOrchestrator,
-    collect_user_context,
-    ensure_user_health_profile,
-    run_food_analysis_pipeline,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from .clients import LLMClientBase, StructuredResponseParser
+    from .models import ConversationPrompts, HealthInfoRepository
+    from .workflow import HealthSessionManager
+
+# Public names resolved on first access (PEP 562) so ``import llm_module`` does
+# not pull in pydantic, the orchestrator or a provider SDK up front.
+_LAZY_ATTRS = {
+    "LLMClientBase": "clients",
+    "StructuredResponseParser": "clients",
+    "default_parser": "clients",
+    "ConversationPrompts": "models",
+    "FoodAnalysisResponse": "models",
+    "FoodAnalysisResult": "models",
+    "FoodIngredient": "models",
+    "FoodPortionAnalysis": "models",
+    "HealthInfo": "models",
+    "HealthInfoRepository": "models",
+    "LLMRequestContext": "models",
+    "QuestionEvaluation": "models",
+    "MealIntent": "models",
+    "Recipe": "models",
+    "RecipeIngredient": "models",
+    "UserContext": "models",
+    "HEALTH_FIELD_MAPPING": "question_bank",
+    "HEALTH_QUESTION_ORDER": "question_bank",
+    "HEALTH_REQUIRED_RETRY_MESSAGES": "question_bank",
+    "MEAL_QUESTION_KEYS": "question_bank",
+    "QUESTION_SPECS": "question_bank",
+    "QUESTION_SPEC_BY_KEY": "question_bank",
+    "REQUIRED_HEALTH_KEYS": "question_bank",
+    "LLM_STUDIO_RESPONSE_SCHEMA": "responses",
+    "build_system_prompt": "responses",
+    "build_user_prompt": "responses",
+    "HealthSessionManager": "workflow",
+    "LLMOrchestrator": "workflow",
+    "collect_user_context": "workflow",
+    "ensure_user_health_profile": "workflow",
+    "run_food_analysis_pipeline": "workflow",
+    "GeminiClient": "providers.gemini_provider",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
 
 
 def create_client(
@@ -61,7 +79,10 @@ def create_client(
         Additional keyword arguments forwarded to the provider client constructor.
     """
 
-    parser = parser or default_parser()
+    if parser is None:
+        from .clients import default_parser
+
+        parser = default_parser()
     provider_key = provider.lower().strip()
 
     if provider_key == "lmstudio":
@@ -92,6 +113,8 @@ def create_session_manager(
 ) -> HealthSessionManager:
     """Instantiate a :class:`HealthSessionManager` with supplied hooks."""
 
+    from .workflow import HealthSessionManager
+
     return HealthSessionManager(prompts=prompts, repository=repository)
 
 
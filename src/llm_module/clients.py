@@ -2,14 +2,27 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Protocol, runtime_checkable
+from typing import Optional, Protocol, Tuple, runtime_checkable
 
 from .models import FoodAnalysisResponse, LLMRequestContext, Recipe
 from .utils import strip_json_code_fence
 
 
+def parse_food_analysis(raw: str | bytes) -> FoodAnalysisResponse:
+    """Validate an LLM's JSON reply straight into :class:`FoodAnalysisResponse`.
+
+    pydantic-core parses the text itself, so no intermediate dict tree is built.
+    Markdown code fences around ``str`` input are stripped first. Malformed JSON
+    raises pydantic's ``ValidationError``, a ``ValueError``.
+    """
+
+    if isinstance(raw, str):
+        raw = strip_json_code_fence(raw)
+    return FoodAnalysisResponse.model_validate_json(raw)
+
+
 class LLMClientError(RuntimeError):
     """Raised when an LLM provider fails to fulfil a request."""
 
@@ -25,8 +38,11 @@ class StructuredResponseParser(Protocol):
 class LLMClientBase(ABC):
     """Abstract base class ensuring consistent behaviour across providers."""
 
-    def __init__(self, *, parser: StructuredResponseParser) -> None:
+    def __init__(self, *, parser: StructuredResponseParser, max_concurrency: int = 8) -> None:
         self._parser = parser
+        self._max_concurrency = max_concurrency
+        # (loop, semaphore); asyncio semaphores must not be shared across event loops.
+        self._loop_semaphore: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
 
     @abstractmethod
     def complete(
@@ -38,6 +54,46 @@ class LLMClientBase(ABC):
     ) -> str:
         """Perform a completion call and return the raw model text."""
 
+    async def acomplete(
+        self,
+        *,
+        prompt: str,
+        request_context: LLMRequestContext,
+        system_prompt: Optional[str] = None,
+    ) -> str:
+        """Awaitable :meth:`complete`; at most ``max_concurrency`` calls are in flight."""
+
+        async with self._semaphore():
+            return await self._acomplete(
+                prompt=prompt,
+                request_context=request_context,
+                system_prompt=system_prompt,
+            )
+
+    async def _acomplete(
+        self,
+        *,
+        prompt: str,
+        request_context: LLMRequestContext,
+        system_prompt: Optional[str] = None,
+    ) -> str:
+        """Provider hook for :meth:`acomplete`; defaults to ``complete`` in a worker thread."""
+
+        return await asyncio.to_thread(
+            self.complete,
+            prompt=prompt,
+            request_context=request_context,
+            system_prompt=system_prompt,
+        )
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        current = self._loop_semaphore
+        if current is None or current[0] is not loop:
+            current = (loop, asyncio.Semaphore(self._max_concurrency))
+            self._loop_semaphore = current
+        return current[1]
+
     def generate_structured(
         self,
         *,
@@ -52,15 +108,35 @@ class LLMClientBase(ABC):
             request_context=request_context,
             system_prompt=system_prompt,
         )
+        return self._parse_structured(raw_output, request_context)
+
+    async def agenerate_structured(
+        self,
+        *,
+        prompt: str,
+        request_context: LLMRequestContext,
+        system_prompt: Optional[str] = None,
+    ) -> FoodAnalysisResponse:
+        """Awaitable :meth:`generate_structured`, built on :meth:`acomplete`."""
+
+        raw_output = await self.acomplete(
+            prompt=prompt,
+            request_context=request_context,
+            system_prompt=system_prompt,
+        )
+        return self._parse_structured(raw_output, request_context)
+
+    def _parse_structured(
+        self, raw_output: str, request_context: LLMRequestContext
+    ) -> FoodAnalysisResponse:
+        """Turn raw completion text into a response, honouring ``response_format``."""
 
         # If response_format is provided, the model should return structured output
         if request_context.response_format:
             cleaned_output = strip_json_code_fence(raw_output)
             try:
-                # Parse the structured response directly
-                parsed_data = json.loads(cleaned_output)
-                return FoodAnalysisResponse.model_validate(parsed_data)
-            except (json.JSONDecodeError, ValueError) as exc:
+                return parse_food_analysis(cleaned_output)
+            except ValueError as exc:
                 # Fallback: if parsing fails, wrap the raw text in a response object
                 # so the frontend can attempt to parse it from the message text.
                 fallback_recipe = Recipe(title="Recipe", steps=[cleaned_output])
@@ -78,12 +154,7 @@ def default_parser() -> StructuredResponseParser:
 
     class _Parser:
         def parse(self, raw_output: str) -> FoodAnalysisResponse:  # noqa: D401
-            try:
-                payload: Dict[str, Any] = json.loads(strip_json_code_fence(raw_output))
-            except json.JSONDecodeError as exc:  # pragma: no cover - defensive
-                raise ValueError(f"Expected JSON string from LLM, received: {raw_output}") from exc
-
-            return FoodAnalysisResponse.parse_obj(payload)
+            return parse_food_analysis(raw_output)
 
     return _Parser()
 
@@ -93,4 +164,5 @@ __all__ = [
     "LLMClientError",
     "StructuredResponseParser",
     "default_parser",
+    "parse_food_analysis",
 ]
@@ -2,13 +2,64 @@
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, Callable, Dict, List, Literal, Optional
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Annotated, Any, Callable, Dict, List, Literal, Mapping, Optional
 
 from pydantic import BaseModel, Field, field_validator, ConfigDict, model_validator
 
 
-class HealthInfo(BaseModel):
+class _Model(BaseModel):
+    """Base for the module's models: core schemas are built on first use, not at import."""
+
+    model_config = ConfigDict(defer_build=True)
+
+
+def _utcnow() -> datetime:
+    """Naive UTC timestamp, as datetime.utcnow() produced (that call is deprecated)."""
+
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _step_from_dict(item: Dict[str, Any]) -> str:
+    text = item.get("instruction") or item.get("text") or item.get("step")
+    if text is None:
+        text = item.get("instructions")
+    if text is None:
+        # fall back to dumping the dict for debugging but keep pipeline alive
+        text = item
+    return str(text)
+
+
+def _step_from_seq(item: Any) -> str:
+    return " ".join(str(part) for part in item)
+
+
+def _step_fallback(item: Any) -> str:
+    """Subclasses of the dispatched types still get their structured handling."""
+
+    if isinstance(item, dict):
+        return _step_from_dict(item)
+    if isinstance(item, (list, tuple)):
+        return _step_from_seq(item)
+    return str(item)
+
+
+# Recipe step coercion keyed on the exact item type: one dict lookup per step.
+_STEP_DISPATCH: Dict[type, Callable[[Any], str]] = {
+    str: str,
+    dict: _step_from_dict,
+    list: _step_from_seq,
+    tuple: _step_from_seq,
+}
+
+
+# Keys a legacy (unwrapped) response may carry the recipe title under, by priority.
+_LEGACY_TITLE_KEYS = ("recipe_name", "title", "food_name", "name")
+
+
+class HealthInfo(_Model):
     """Structured representation of the user's health information."""
 
     age: Optional[int] = Field(None, ge=0, description="Age in years")
@@ -32,7 +83,7 @@ class HealthInfo(BaseModel):
     medications: List[str] = Field(default_factory=list)
     allergies: List[str] = Field(default_factory=list)
     dietary_preferences: List[str] = Field(default_factory=list)
-    last_updated: datetime = Field(default_factory=datetime.utcnow)
+    last_updated: datetime = Field(default_factory=_utcnow)
 
     @field_validator("medications", "allergies", "dietary_preferences", mode="before")
     @classmethod
@@ -41,10 +92,19 @@ class HealthInfo(BaseModel):
 
         if not value:
             return []
+        if type(value) is list:
+            return value
         return list(value)
 
+    @field_validator("gender", "underlying_disease", "race", "activity_level", mode="after")
+    @classmethod
+    def _intern_category(cls, value: Optional[str]) -> Optional[str]:  # noqa: D401
+        """Share one string object per distinct value across profiles."""
+
+        return sys.intern(value) if type(value) is str else value
+
 
-class MealIntent(BaseModel):
+class MealIntent(_Model):
     """The immediate context for a food recommendation request."""
 
     current_glucose_mg_dl: Optional[float] = Field(
@@ -65,48 +125,43 @@ class MealIntent(BaseModel):
     )
 
 
-class UserContext(BaseModel):
+class UserContext(_Model):
     """Combined session context used for LLM prompting."""
 
     health_info: HealthInfo
     meal_intent: MealIntent
 
 
-class RecipeIngredient(BaseModel):
+class RecipeIngredient(_Model):
     """Single ingredient entry for the generated recipe."""
 
     name: str = Field(..., description="Ingredient name")
     amount: str = Field(..., description="Ingredient amount with units")
 
-    @model_validator(mode="before")
-    def _migrate_quantity(cls, value: Any) -> Any:
-        """Support payloads that use `quantity` instead of `amount`."""
-        if isinstance(value, dict) and "amount" not in value and "quantity" in value:
-            value["amount"] = value.get("quantity")
-        return value
-
     @model_validator(mode="before")
     def _migrate_legacy(cls, value: Any) -> Any:  # noqa: D401
-        """Support legacy payloads that used `amount_g`."""
+        """Resolve `amount` from legacy `amount_g`/`quantity` keys and coerce it to a string."""
 
-        if isinstance(value, dict) and "amount" not in value and "amount_g" in value:
-            amount_value = value.get("amount_g")
-            if isinstance(amount_value, (int, float)):
-                value["amount"] = f"{amount_value} g"
-            else:
-                value["amount"] = str(amount_value)
-        return value
+        if not isinstance(value, dict):
+            return value
 
-    @field_validator("amount", mode="before")
-    def _ensure_string(cls, value: Any) -> str:  # noqa: D401
-        """Coerce amount values to strings."""
+        if "amount" in value:
+            amount = value["amount"]
+        elif "amount_g" in value:
+            amount = value["amount_g"]
+            if isinstance(amount, (int, float)):
+                amount = f"{amount} g"
+        elif "quantity" in value:
+            amount = value["quantity"]
+        else:
+            return value
 
-        if isinstance(value, (int, float)):
-            return f"{value}"
-        return str(value)
+        if type(amount) is str:
+            return value if "amount" in value else {**value, "amount": amount}
+        return {**value, "amount": str(amount)}
 
 
-class Recipe(BaseModel):
+class Recipe(_Model):
     """Structured recipe guidance returned from the LLM."""
 
     model_config = ConfigDict(populate_by_name=True)
@@ -134,21 +189,11 @@ class Recipe(BaseModel):
         if not isinstance(value, list):
             return []
 
-        normalised: List[str] = []
-        for item in value:
-            if isinstance(item, dict):
-                text = item.get("instruction") or item.get("text") or item.get("step")
-                if text is None and "instructions" in item:
-                    text = item["instructions"]
-                if text is None:
-                    # fall back to dumping the dict for debugging but keep pipeline alive
-                    text = str(item)
-                normalised.append(str(text))
-            elif isinstance(item, (list, tuple)):
-                normalised.append(" ".join(str(part) for part in item))
-            else:
-                normalised.append(str(item))
-        return normalised
+        # Schema-conforming responses are already a list of strings.
+        if all(type(item) is str for item in value):
+            return value
+
+        return [_STEP_DISPATCH.get(type(item), _step_fallback)(item) for item in value]
 
     @property
     def food_name(self) -> str:
@@ -157,7 +202,7 @@ class Recipe(BaseModel):
         return self.title
 
 
-class FoodAnalysisResponse(BaseModel):
+class FoodAnalysisResponse(_Model):
     """Structured response from the LLM describing the recipe."""
 
     @model_validator(mode="before")
@@ -167,42 +212,38 @@ class FoodAnalysisResponse(BaseModel):
         if not isinstance(value, dict):
             return value
 
-        if "recipe" in value and isinstance(value["recipe"], dict):
+        get = value.get
+        if isinstance(get("recipe"), dict):
             return value
 
-        recipe_payload: Dict[str, Any] = {}
-
-        if "recipe_name" in value:
-            recipe_payload["title"] = value.get("recipe_name")
-        elif "title" in value:
-            recipe_payload["title"] = value.get("title")
-        elif "food_name" in value:
-            recipe_payload["title"] = value.get("food_name")
-        elif "name" in value:
-            recipe_payload["title"] = value.get("name")
-        elif "food" in value and isinstance(value["food"], dict):
-            recipe_payload["title"] = value["food"].get("food_name")
-
-        if "ingredients" in value and isinstance(value["ingredients"], list):
-            recipe_payload["ingredients"] = value["ingredients"]
-        elif "food" in value and isinstance(value["food"], dict):
-            recipe_payload["ingredients"] = value["food"].get("ingredients")
-
-        if "steps" in value and isinstance(value["steps"], list):
-            recipe_payload["steps"] = value["steps"]
-        elif "instructions" in value:
-            instructions = value.get("instructions")
-            if isinstance(instructions, list):
-                recipe_payload["steps"] = instructions
-            elif isinstance(instructions, str):
-                recipe_payload["steps"] = [instructions]
-
-        if "steps" not in recipe_payload:
-            recipe_payload["steps"] = []
-        if "ingredients" not in recipe_payload:
-            recipe_payload["ingredients"] = []
-        if "title" not in recipe_payload or not recipe_payload["title"]:
-            recipe_payload["title"] = value.get("title") or "Low-GI Recipe"
+        food = get("food")
+        if not isinstance(food, dict):
+            food = None
+
+        # First title-like key present wins, even when its value is empty.
+        title_key = next((key for key in _LEGACY_TITLE_KEYS if key in value), None)
+        if title_key is not None:
+            title = value[title_key]
+        else:
+            title = food.get("food_name") if food is not None else None
+
+        ingredients = get("ingredients")
+        if not isinstance(ingredients, list):
+            ingredients = food.get("ingredients") if food is not None else []
+
+        steps = get("steps")
+        if not isinstance(steps, list):
+            steps = get("instructions")
+            if isinstance(steps, str):
+                steps = [steps]
+            elif not isinstance(steps, list):
+                steps = []
+
+        recipe_payload: Dict[str, Any] = {
+            "title": title or get("title") or "Low-GI Recipe",
+            "ingredients": ingredients,
+            "steps": steps,
+        }
 
         return {"recipe": recipe_payload}
 
@@ -223,7 +264,7 @@ class FoodAnalysisResponse(BaseModel):
         return self.recipe
 
 
-class FoodAnalysisResult(BaseModel):
+class FoodAnalysisResult(_Model):
     """Full payload combining the recipe and health parameters."""
 
     health_parameters: HealthInfo = Field(
@@ -250,7 +291,10 @@ FoodIngredient = RecipeIngredient
 FoodPortionAnalysis = Recipe
 
 
-class ConversationPrompts(BaseModel):
+# The two hook containers hold plain callables with nothing to validate, so they
+# are dataclasses rather than models.
+@dataclass(slots=True, frozen=True)
+class ConversationPrompts:
     """Customisable prompt hooks supplied by the host application."""
 
     ask_health_info: Callable[[str], str]
@@ -258,26 +302,49 @@ class ConversationPrompts(BaseModel):
     notify: Callable[[str], None]
 
 
-class HealthInfoRepository(BaseModel):
+@dataclass(slots=True, frozen=True)
+class HealthInfoRepository:
     """Persistence hooks for reading and writing health data."""
 
     load: Callable[[], Optional[HealthInfo]]
     save: Callable[[HealthInfo], None]
 
 
-class LLMRequestContext(BaseModel):
-    """Information passed to the LLM provider."""
+class LLMRequestContext(_Model):
+    """Information passed to the LLM provider.
+
+    Frozen so providers can reuse whatever they derive from a context for as long
+    as the same instance keeps being passed in; use ``model_copy(update=...)`` to
+    change a field.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     model_name: str = Field(..., description="Provider specific model identifier")
-    extra_options: Dict[str, object] = Field(
-        default_factory=dict, description="Additional provider kwargs"
+    # Validation copies the input into a dict the context owns; providers only
+    # read it, so no per-request defensive copy is needed.
+    extra_options: Mapping[str, object] = Field(
+        default_factory=dict, description="Additional provider kwargs (read-only)"
     )
     response_format: Optional[Dict[str, object]] = Field(
         None, description="JSON schema for structured output format"
     )
 
+    @field_validator("response_format", mode="wrap")
+    @classmethod
+    def _keep_schema(cls, value: Any, handler: Callable[[Any], Any]) -> Any:  # noqa: D401
+        """Store plain-dict schemas as given rather than as a validated copy.
+
+        Schemas are module-level constants, so every context built for the same
+        output type then hands the provider the same object.
+        """
+
+        if type(value) is dict:
+            return value
+        return handler(value)
+
 
-class QuestionEvaluation(BaseModel):
+class QuestionEvaluation(_Model):
     """LLM-evaluated result for a single conversational answer."""
 
     question: str = Field(
@@ -313,7 +380,7 @@ class QuestionEvaluation(BaseModel):
     )
 
 
-class ProfileUpdateItem(BaseModel):
+class ProfileUpdateItem(_Model):
     """Single field update returned from a profile revision prompt."""
 
     question: str = Field(..., description="Profile field identifier to update")
@@ -331,7 +398,7 @@ class ProfileUpdateItem(BaseModel):
     )
 
 
-class ProfileUpdateResponse(BaseModel):
+class ProfileUpdateResponse(_Model):
     """Array wrapper describing proposed profile updates."""
 
     updates: List[ProfileUpdateItem] = Field(default_factory=list)
@@ -1,9 +1,38 @@
 """Provider entry points."""
 
-from .gemini_provider import GeminiClient
-from .huggingface_provider import HuggingFaceClient
-from .lmstudio import LMStudioClient
-from .openai_provider import OpenAIClient
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .gemini_provider import GeminiClient
+    from .huggingface_provider import HuggingFaceClient
+    from .lmstudio import LMStudioClient
+    from .openai_provider import OpenAIClient
+
+# Each client is imported on first access (PEP 562) so one provider's SDK
+# isn't loaded just because another provider was asked for.
+_LAZY_ATTRS = {
+    "GeminiClient": "gemini_provider",
+    "HuggingFaceClient": "huggingface_provider",
+    "LMStudioClient": "lmstudio",
+    "OpenAIClient": "openai_provider",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
 
 __all__ = [
     "GeminiClient",
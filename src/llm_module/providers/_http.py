@@ -0,0 +1,31 @@
+"""httpx transports shared by the REST-based providers."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from importlib.util import find_spec
+
+import httpx
+
+# HTTP/2 needs the optional ``h2`` package (``pip install httpx[http2]``);
+# without it the clients quietly stay on HTTP/1.1.
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+
+@lru_cache(maxsize=2)
+def shared_client(http2: bool = True) -> httpx.Client:
+    """Process-wide pooled sync client, so providers reuse warm connections.
+
+    HTTP/2 multiplexes concurrent requests on one connection. Callers pass their
+    own per-request ``timeout`` and must not close the client.
+    """
+
+    return httpx.Client(http2=http2 and HTTP2_AVAILABLE, limits=_LIMITS, timeout=60)
+
+
+def new_async_client(*, http2: bool = True, timeout: float = 60) -> httpx.AsyncClient:
+    """Pooled async client; one per provider, as connections are tied to an event loop."""
+
+    return httpx.AsyncClient(http2=http2 and HTTP2_AVAILABLE, limits=_LIMITS, timeout=timeout)
@@ -2,15 +2,38 @@
 
 from __future__ import annotations
 
-import copy
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 import json
 
-import google.generativeai as genai
-
 from ..clients import LLMClientBase, LLMClientError
 from ..models import LLMRequestContext
 
+if TYPE_CHECKING:
+    import google.generativeai as genai
+
+
+@lru_cache(maxsize=16)
+def _get_model(model_name: str, system_prompt: Optional[str]) -> "genai.GenerativeModel":
+    """Shared GenerativeModel per (model, system prompt); the app uses only a few."""
+
+    import google.generativeai as genai
+
+    return genai.GenerativeModel(model_name=model_name, system_instruction=system_prompt)
+
+
+# extra_options keys complete() merges itself rather than forwarding.
+_CONSUMED_OPTIONS = frozenset({"generation_config", "safety_settings"})
+
+
+def _chunk_text(chunk: Any) -> str:
+    """Text of one streamed chunk; chunks without text parts contribute nothing."""
+
+    try:
+        return chunk.text or ""
+    except (AttributeError, IndexError, ValueError):
+        return ""
+
 
 class GeminiClient(LLMClientBase):
     """Client targeting Google Gemini via the generative AI Python SDK."""
@@ -23,28 +46,36 @@ class GeminiClient(LLMClientBase):
         default_generation_config: Optional[Dict[str, Any]] = None,
         default_safety_settings: Optional[Any] = None,
         strict_json: bool = True,
+        max_concurrency: int = 8,
     ) -> None:
         if not api_key:
             raise ValueError("GeminiClient requires a valid api_key")
 
-        super().__init__(parser=parser)
+        super().__init__(parser=parser, max_concurrency=max_concurrency)
+        # Imported here so loading the provider package doesn't pull in the SDK.
+        import google.generativeai as genai
+
         genai.configure(api_key=api_key)
 
         self._default_generation_config = default_generation_config or {}
         self._default_safety_settings = default_safety_settings
         self._strict_json = strict_json
+        # Last (context, kwargs) pair; contexts are frozen, so one reused instance
+        # always maps to the same kwargs. Swapped as one tuple for thread safety.
+        self._last_kwargs: Optional[Tuple[LLMRequestContext, Dict[str, Any]]] = None
 
-    def complete(
-        self,
-        *,
-        prompt: str,
-        request_context: LLMRequestContext,
-        system_prompt: Optional[str] = None,
-    ) -> str:
-        generation_config = copy.deepcopy(self._default_generation_config)
-        extra_options = copy.deepcopy(request_context.extra_options)
+    def _response_kwargs(self, request_context: LLMRequestContext) -> Dict[str, Any]:
+        """generate_content kwargs for a context; callers must not mutate the result."""
+
+        last = self._last_kwargs
+        if last is not None and last[0] is request_context:
+            return last[1]
 
-        generation_config.update(extra_options.pop("generation_config", {}))
+        options = request_context.extra_options
+        generation_config = {
+            **self._default_generation_config,
+            **options.get("generation_config", {}),
+        }
 
         response_kwargs: Dict[str, Any] = {}
 
@@ -53,20 +84,34 @@ class GeminiClient(LLMClientBase):
             if self._strict_json:
                 response_kwargs.setdefault("response_mime_type", "application/json")
 
-        safety_settings = extra_options.pop("safety_settings", self._default_safety_settings)
+        safety_settings = options.get("safety_settings", self._default_safety_settings)
 
         if generation_config:
             response_kwargs["generation_config"] = generation_config
         if safety_settings is not None:
             response_kwargs["safety_settings"] = safety_settings
 
-        response_kwargs.update(extra_options)
+        # Everything else is forwarded as-is; the options mapping itself is never modified.
+        response_kwargs.update(
+            (key, value) for key, value in options.items() if key not in _CONSUMED_OPTIONS
+        )
+        # Stream so chunks are collected as they arrive instead of in one final read.
+        response_kwargs.setdefault("stream", True)
+
+        self._last_kwargs = (request_context, response_kwargs)
+        return response_kwargs
+
+    def complete(
+        self,
+        *,
+        prompt: str,
+        request_context: LLMRequestContext,
+        system_prompt: Optional[str] = None,
+    ) -> str:
+        response_kwargs = self._response_kwargs(request_context)
 
         try:
-            model = genai.GenerativeModel(
-                model_name=request_context.model_name,
-                system_instruction=system_prompt,
-            )
+            model = _get_model(request_context.model_name, system_prompt)
 
             try:
                 response = model.generate_content(
@@ -74,59 +119,125 @@ class GeminiClient(LLMClientBase):
                     **response_kwargs,
                 )
             except TypeError:
-                # Older SDKs may not support response_schema/response_mime_type.
-                # Remove them unconditionally and guide the model via prompt.
-                had_schema = bool(request_context.response_format)
-                response_kwargs.pop("response_schema", None)
-                response_kwargs.pop("response_mime_type", None)
-
-                if had_schema and request_context.response_format:
-                    schema_text = json.dumps(request_context.response_format, indent=2)
-                    if system_prompt:
-                        system_prompt = (
-                            f"{system_prompt}\nYou must output ONLY JSON that conforms to this schema:\n{schema_text}"
-                        )
-                    else:
-                        prompt = (
-                            f"Return ONLY JSON that conforms to this JSON schema:\n{schema_text}\n\n" + prompt
-                        )
-                    # Recreate model to apply updated system_instruction
-                    model = genai.GenerativeModel(
-                        model_name=request_context.model_name,
-                        system_instruction=system_prompt,
-                    )
+                prompt, system_prompt, response_kwargs = _schema_in_prompt(
+                    request_context, prompt, system_prompt, response_kwargs
+                )
+                # Switch model to apply updated system_instruction
+                model = _get_model(request_context.model_name, system_prompt)
 
                 response = model.generate_content(
                     prompt,
                     **response_kwargs,
                 )
+
+            # Drained inside this block so mid-stream transport errors read as request failures.
+            fragments = [text for chunk in response if (text := _chunk_text(chunk))] if response is not None else []
         except Exception as exc:  # pragma: no cover - network dependent
             raise LLMClientError(f"Gemini request failed: {exc}") from exc
 
+        return _response_text(response, fragments)
+
+    async def _acomplete(
+        self,
+        *,
+        prompt: str,
+        request_context: LLMRequestContext,
+        system_prompt: Optional[str] = None,
+    ) -> str:
+        response_kwargs = self._response_kwargs(request_context)
+
         try:
-            if response is None:
-                raise ValueError("Empty response from Gemini")
-
-            text_payload = getattr(response, "text", None)
-            if text_payload:
-                return text_payload
-
-            candidates = getattr(response, "candidates", None) or []
-            first_candidate = candidates[0]
-            parts = getattr(first_candidate, "content", None)
-            if parts and hasattr(parts, "parts"):
-                text_fragments = [getattr(part, "text", "") for part in parts.parts if getattr(part, "text", "")]
-                if text_fragments:
-                    return "".join(text_fragments)
-
-            if parts and isinstance(parts, list):
-                text_fragments = [getattr(part, "text", "") for part in parts if getattr(part, "text", "")]
-                if text_fragments:
-                    return "".join(text_fragments)
-
-            raise ValueError("Gemini response did not contain text content")
-        except (AttributeError, IndexError, ValueError) as exc:  # pragma: no cover - defensive
-            raise LLMClientError(f"Unexpected Gemini response payload: {response}") from exc
+            model = _get_model(request_context.model_name, system_prompt)
+
+            try:
+                response = await model.generate_content_async(
+                    prompt,
+                    **response_kwargs,
+                )
+            except TypeError:
+                prompt, system_prompt, response_kwargs = _schema_in_prompt(
+                    request_context, prompt, system_prompt, response_kwargs
+                )
+                model = _get_model(request_context.model_name, system_prompt)
+
+                response = await model.generate_content_async(
+                    prompt,
+                    **response_kwargs,
+                )
+
+            fragments = []
+            if response is not None:
+                async for chunk in response:
+                    if text := _chunk_text(chunk):
+                        fragments.append(text)
+        except Exception as exc:  # pragma: no cover - network dependent
+            raise LLMClientError(f"Gemini request failed: {exc}") from exc
+
+        return _response_text(response, fragments)
+
+
+def _schema_in_prompt(
+    request_context: LLMRequestContext,
+    prompt: str,
+    system_prompt: Optional[str],
+    response_kwargs: Dict[str, Any],
+) -> Tuple[str, Optional[str], Dict[str, Any]]:
+    """Retry arguments for SDKs that reject response_schema/response_mime_type.
+
+    Those kwargs are dropped unconditionally and the schema is put into the
+    system prompt (or, without one, the user prompt) instead.
+    """
+
+    response_kwargs = {
+        key: value
+        for key, value in response_kwargs.items()
+        if key not in ("response_schema", "response_mime_type")
+    }
+
+    if request_context.response_format:
+        schema_text = json.dumps(request_context.response_format, indent=2)
+        if system_prompt:
+            system_prompt = (
+                f"{system_prompt}\nYou must output ONLY JSON that conforms to this schema:\n{schema_text}"
+            )
+        else:
+            prompt = (
+                f"Return ONLY JSON that conforms to this JSON schema:\n{schema_text}\n\n" + prompt
+            )
+
+    return prompt, system_prompt, response_kwargs
+
+
+def _response_text(response: Any, fragments: List[str]) -> str:
+    """Joined streamed text, else whatever text the final response object carries."""
+
+    if fragments:
+        return "".join(fragments)
+
+    try:
+        if response is None:
+            raise ValueError("Empty response from Gemini")
+
+        text_payload = getattr(response, "text", None)
+        if text_payload:
+            return text_payload
+
+        candidates = response.candidates or []
+        first_candidate = candidates[0]
+        parts = getattr(first_candidate, "content", None)
+        if parts and hasattr(parts, "parts"):
+            text_fragments = [text for part in parts.parts if (text := getattr(part, "text", ""))]
+            if text_fragments:
+                return "".join(text_fragments)
+
+        if parts and isinstance(parts, list):
+            text_fragments = [text for part in parts if (text := getattr(part, "text", ""))]
+            if text_fragments:
+                return "".join(text_fragments)
+
+        raise ValueError("Gemini response did not contain text content")
+    except (AttributeError, IndexError, ValueError) as exc:  # pragma: no cover - defensive
+        raise LLMClientError(f"Unexpected Gemini response payload: {response}") from exc
 
 
 __all__ = ["GeminiClient"]
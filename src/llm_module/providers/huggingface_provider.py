@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Dict, Optional
 
-import requests
+import httpx
 
+from . import _http
 from ..clients import LLMClientBase, LLMClientError
 from ..models import LLMRequestContext
 
@@ -20,13 +21,19 @@ class HuggingFaceClient(LLMClientBase):
         endpoint_url: str,
         api_token: Optional[str] = None,
         timeout: int = 60,
-        session: Optional[requests.Session] = None,
+        session: Optional[httpx.Client] = None,
+        async_session: Optional[httpx.AsyncClient] = None,
+        max_concurrency: int = 8,
+        http2: bool = True,
     ) -> None:
-        super().__init__(parser=parser)
+        super().__init__(parser=parser, max_concurrency=max_concurrency)
         self._endpoint_url = endpoint_url.rstrip("/")
         self._api_token = api_token
         self._timeout = timeout
-        self._session = session or requests.Session()
+        self._http2 = http2
+        self._session = session or _http.shared_client(http2)
+        # Created on first acomplete() so sync-only callers never build it.
+        self._async_session = async_session
 
     def complete(
         self,
@@ -35,33 +42,67 @@ class HuggingFaceClient(LLMClientBase):
         request_context: LLMRequestContext,
         system_prompt: Optional[str] = None,
     ) -> str:
-        headers = {"Content-Type": "application/json"}
-        if self._api_token:
-            headers["Authorization"] = f"Bearer {self._api_token}"
-
-        payload = {
-            "inputs": _combine_prompts(system_prompt, prompt),
-            "parameters": {"max_new_tokens": 512, **request_context.extra_options},
-        }
-
         try:
             response = self._session.post(
                 self._endpoint_url,
-                headers=headers,
-                json=payload,
+                headers=self._headers(),
+                json=_payload(prompt, request_context, system_prompt),
                 timeout=self._timeout,
             )
             response.raise_for_status()
-        except requests.RequestException as exc:
+        except httpx.HTTPError as exc:
             raise LLMClientError(f"Hugging Face request failed: {exc}") from exc
 
-        data = response.json()
+        return _generated_text(response.json())
+
+    async def _acomplete(
+        self,
+        *,
+        prompt: str,
+        request_context: LLMRequestContext,
+        system_prompt: Optional[str] = None,
+    ) -> str:
+        if self._async_session is None:
+            self._async_session = _http.new_async_client(http2=self._http2, timeout=self._timeout)
+
         try:
-            if isinstance(data, list):
-                return data[0]["generated_text"]
-            return data["generated_text"]
-        except (KeyError, IndexError, TypeError) as exc:  # pragma: no cover - defensive
-            raise LLMClientError(f"Unexpected Hugging Face response payload: {data}") from exc
+            response = await self._async_session.post(
+                self._endpoint_url,
+                headers=self._headers(),
+                json=_payload(prompt, request_context, system_prompt),
+                timeout=self._timeout,
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            raise LLMClientError(f"Hugging Face request failed: {exc}") from exc
+
+        return _generated_text(response.json())
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        if self._api_token:
+            headers["Authorization"] = f"Bearer {self._api_token}"
+        return headers
+
+
+def _payload(
+    prompt: str,
+    request_context: LLMRequestContext,
+    system_prompt: Optional[str],
+) -> Dict[str, Any]:
+    return {
+        "inputs": _combine_prompts(system_prompt, prompt),
+        "parameters": {"max_new_tokens": 512, **request_context.extra_options},
+    }
+
+
+def _generated_text(data: Any) -> str:
+    try:
+        if isinstance(data, list):
+            return data[0]["generated_text"]
+        return data["generated_text"]
+    except (KeyError, IndexError, TypeError) as exc:  # pragma: no cover - defensive
+        raise LLMClientError(f"Unexpected Hugging Face response payload: {data}") from exc
 
 
 def _combine_prompts(system_prompt: Optional[str], user_prompt: str) -> str:
@@ -71,4 +112,3 @@ def _combine_prompts(system_prompt: Optional[str], user_prompt: str) -> str:
 
 
 __all__ = ["HuggingFaceClient"]
-
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import json
-from typing import Optional
+from typing import Any, Dict, Optional
 
-import requests
+import httpx
 
+from . import _http
 from ..clients import LLMClientBase, LLMClientError
 from ..models import LLMRequestContext
 
@@ -20,12 +20,18 @@ class LMStudioClient(LLMClientBase):
         parser,
         base_url: str = "http://127.0.0.1:1234/v1",
         timeout: int = 60,
-        session: Optional[requests.Session] = None,
+        session: Optional[httpx.Client] = None,
+        async_session: Optional[httpx.AsyncClient] = None,
+        max_concurrency: int = 8,
+        http2: bool = True,
     ) -> None:
-        super().__init__(parser=parser)
+        super().__init__(parser=parser, max_concurrency=max_concurrency)
         self._base_url = base_url.rstrip("/")
         self._timeout = timeout
-        self._session = session or requests.Session()
+        self._http2 = http2
+        self._session = session or _http.shared_client(http2)
+        # Created on first acomplete() so sync-only callers never build it.
+        self._async_session = async_session
 
     def complete(
         self,
@@ -36,39 +42,72 @@ class LMStudioClient(LLMClientBase):
     ) -> str:
         url = f"{self._base_url}/chat/completions"
         headers = {"Content-Type": "application/json"}
-
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-
-        payload = {
-            "model": request_context.model_name,
-            "messages": messages,
-            **request_context.extra_options,
-        }
-        
-        # Add response_format if provided
-        if request_context.response_format:
-            payload["response_format"] = request_context.response_format
+        payload = _payload(prompt, request_context, system_prompt)
 
         try:
             response = self._session.post(
                 url,
                 headers=headers,
-                data=json.dumps(payload),
+                json=payload,
                 timeout=self._timeout,
             )
             response.raise_for_status()
-        except requests.RequestException as exc:
+        except httpx.HTTPError as exc:
             raise LLMClientError(f"LM Studio request failed: {exc}") from exc
 
-        data = response.json()
+        return _message_content(response.json())
+
+    async def _acomplete(
+        self,
+        *,
+        prompt: str,
+        request_context: LLMRequestContext,
+        system_prompt: Optional[str] = None,
+    ) -> str:
+        if self._async_session is None:
+            self._async_session = _http.new_async_client(http2=self._http2, timeout=self._timeout)
+
         try:
-            return data["choices"][0]["message"]["content"]
-        except (KeyError, IndexError) as exc:  # pragma: no cover - defensive
-            raise LLMClientError(f"Unexpected LM Studio response payload: {data}") from exc
+            response = await self._async_session.post(
+                f"{self._base_url}/chat/completions",
+                headers={"Content-Type": "application/json"},
+                json=_payload(prompt, request_context, system_prompt),
+                timeout=self._timeout,
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            raise LLMClientError(f"LM Studio request failed: {exc}") from exc
 
+        return _message_content(response.json())
 
-__all__ = ["LMStudioClient"]
 
+def _payload(
+    prompt: str,
+    request_context: LLMRequestContext,
+    system_prompt: Optional[str],
+) -> Dict[str, Any]:
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+
+    payload = {
+        "model": request_context.model_name,
+        "messages": messages,
+        **request_context.extra_options,
+    }
+
+    # Add response_format if provided
+    if request_context.response_format:
+        payload["response_format"] = request_context.response_format
+    return payload
+
+
+def _message_content(data: Any) -> str:
+    try:
+        return data["choices"][0]["message"]["content"]
+    except (KeyError, IndexError) as exc:  # pragma: no cover - defensive
+        raise LLMClientError(f"Unexpected LM Studio response payload: {data}") from exc
+
+
+__all__ = ["LMStudioClient"]
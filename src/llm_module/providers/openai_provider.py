@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
 
+from ._http import HTTP2_AVAILABLE
 from ..clients import LLMClientBase, LLMClientError
 from ..models import LLMRequestContext
 
@@ -19,9 +20,18 @@ class OpenAIClient(LLMClientBase):
         parser,
         api_key: Optional[str] = None,
         client: Optional[OpenAI] = None,
+        async_client: Optional[AsyncOpenAI] = None,
+        max_concurrency: int = 8,
+        http2: bool = True,
     ) -> None:
-        super().__init__(parser=parser)
-        self._client = client or OpenAI(api_key=api_key)
+        super().__init__(parser=parser, max_concurrency=max_concurrency)
+        self._api_key = api_key
+        self._http2 = http2 and HTTP2_AVAILABLE
+        self._client = client or OpenAI(
+            api_key=api_key, http_client=DefaultHttpxClient(http2=self._http2)
+        )
+        # Created on first acomplete() so sync-only callers never build it.
+        self._async_client = async_client
 
     def complete(
         self,
@@ -30,34 +40,68 @@ class OpenAIClient(LLMClientBase):
         request_context: LLMRequestContext,
         system_prompt: Optional[str] = None,
     ) -> str:
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-
-        # Prepare request parameters
-        request_params = {
-            "model": request_context.model_name,
-            "messages": messages,
-            **request_context.extra_options,
-        }
-        
-        # Add response_format if provided
-        if request_context.response_format:
-            request_params["response_format"] = request_context.response_format
+        request_params = _request_params(prompt, request_context, system_prompt)
 
         try:
             chat_completion = self._client.chat.completions.create(**request_params)
         except Exception as exc:  # pragma: no cover - network dependent
             raise LLMClientError(f"OpenAI request failed: {exc}") from exc
 
+        return _completion_text(chat_completion)
+
+    async def _acomplete(
+        self,
+        *,
+        prompt: str,
+        request_context: LLMRequestContext,
+        system_prompt: Optional[str] = None,
+    ) -> str:
+        request_params = _request_params(prompt, request_context, system_prompt)
+
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(
+                api_key=self._api_key,
+                http_client=DefaultAsyncHttpxClient(http2=self._http2),
+            )
+
         try:
-            return chat_completion.choices[0].message.content or ""
-        except (AttributeError, IndexError) as exc:  # pragma: no cover - defensive
-            raise LLMClientError(
-                f"Unexpected OpenAI response payload: {chat_completion}"
-            ) from exc
+            chat_completion = await self._async_client.chat.completions.create(**request_params)
+        except Exception as exc:  # pragma: no cover - network dependent
+            raise LLMClientError(f"OpenAI request failed: {exc}") from exc
 
+        return _completion_text(chat_completion)
 
-__all__ = ["OpenAIClient"]
 
+def _request_params(
+    prompt: str,
+    request_context: LLMRequestContext,
+    system_prompt: Optional[str],
+) -> Dict[str, Any]:
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+
+    # Prepare request parameters
+    request_params = {
+        "model": request_context.model_name,
+        "messages": messages,
+        **request_context.extra_options,
+    }
+
+    # Add response_format if provided
+    if request_context.response_format:
+        request_params["response_format"] = request_context.response_format
+    return request_params
+
+
+def _completion_text(chat_completion: Any) -> str:
+    try:
+        return chat_completion.choices[0].message.content or ""
+    except (AttributeError, IndexError) as exc:  # pragma: no cover - defensive
+        raise LLMClientError(
+            f"Unexpected OpenAI response payload: {chat_completion}"
+        ) from exc
+
+
+__all__ = ["OpenAIClient"]
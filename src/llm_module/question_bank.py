@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterator, NamedTuple, Tuple
+from typing import Dict, FrozenSet, Iterator, NamedTuple, Tuple
 
 
 class QuestionSpec(NamedTuple):
@@ -91,26 +91,29 @@ HEALTH_FIELD_MAPPING: Dict[str, str] = {
 }
 
 
-REQUIRED_HEALTH_KEYS = {
-    spec.key
-    for spec in QUESTION_SPECS
-    if spec.category == "health" and spec.required
-}
-
-
-QUESTION_SPEC_BY_KEY: Dict[str, QuestionSpec] = {
-    spec.key: spec for spec in QUESTION_SPECS
-}
-
-
-HEALTH_QUESTION_ORDER = [
-    spec.key for spec in QUESTION_SPECS if spec.category == "health"
-]
-
-
-MEAL_QUESTION_KEYS = [
-    spec.key for spec in QUESTION_SPECS if spec.category == "meal"
-]
+def _index_specs(
+    specs: Tuple[QuestionSpec, ...],
+) -> Tuple[Dict[str, QuestionSpec], FrozenSet[str], Tuple[str, ...], Tuple[str, ...]]:
+    """Build every key lookup in a single pass over the catalogue."""
+
+    by_key: Dict[str, QuestionSpec] = {}
+    required_health: set[str] = set()
+    health_order: list[str] = []
+    meal_keys: list[str] = []
+    for spec in specs:
+        by_key[spec.key] = spec
+        if spec.category == "health":
+            health_order.append(spec.key)
+            if spec.required:
+                required_health.add(spec.key)
+        elif spec.category == "meal":
+            meal_keys.append(spec.key)
+    return by_key, frozenset(required_health), tuple(health_order), tuple(meal_keys)
+
+
+QUESTION_SPEC_BY_KEY, REQUIRED_HEALTH_KEYS, HEALTH_QUESTION_ORDER, MEAL_QUESTION_KEYS = _index_specs(
+    QUESTION_SPECS
+)
 
 
 HEALTH_REQUIRED_RETRY_MESSAGES: Dict[str, str] = {
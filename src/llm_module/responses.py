@@ -3,7 +3,12 @@
 from __future__ import annotations
 
 import json
+import re
+from functools import lru_cache
 from textwrap import dedent
+from typing import Any
+
+from pydantic import BaseModel
 
 from .models import FoodAnalysisResponse, ProfileUpdateResponse, QuestionEvaluation
 
@@ -47,11 +52,6 @@ FOOD_ANALYSIS_SCHEMA = {
     "required": ["recipe"]
 }
 
-LLM_STUDIO_RESPONSE_SCHEMA = json.dumps(
-    FoodAnalysisResponse.model_json_schema(),
-    indent=2,
-)
-
 
 # JSON schema for question evaluation
 QUESTION_EVALUATION_SCHEMA_DICT = {
@@ -81,36 +81,71 @@ PROFILE_UPDATE_SCHEMA_DICT = {
     "required": ["question", "ask_again", "accepted_value", "explanation", "next_question", "raw_value"]
 }
 
-QUESTION_EVALUATION_SCHEMA = json.dumps(
-    QuestionEvaluation.model_json_schema(),
-    indent=2,
-)
 
+@lru_cache(maxsize=None)
+def _schema_json(model: type[BaseModel]) -> str:
+    """Indented JSON schema of ``model``, generated on first use rather than at import."""
 
-PROFILE_UPDATE_SCHEMA = json.dumps(
-    ProfileUpdateResponse.model_json_schema(),
-    indent=2,
-)
+    return json.dumps(model.model_json_schema(), indent=2)
 
 
-def build_system_prompt() -> str:
-    """Return the system prompt guiding the model to emit structured JSON."""
+# Module constants kept for callers; each is rendered from its model on first access.
+_LAZY_SCHEMAS = {
+    "LLM_STUDIO_RESPONSE_SCHEMA": FoodAnalysisResponse,
+    "QUESTION_EVALUATION_SCHEMA": QuestionEvaluation,
+    "PROFILE_UPDATE_SCHEMA": ProfileUpdateResponse,
+}
 
-    return dedent(
-        """
-        You are a world-class diabetes meal planning assistant. Your primary goal is to craft low-glycemic impact, nutrient-balanced, single-serving recipes.
-        You MUST ALWAYS produce output that can be parsed as JSON matching the provided schema.
-        The `ingredients` and `steps` arrays in your response MUST NOT be empty.
-        If the user's request is too vague to create a full recipe, you MUST ask for more details instead of returning an empty recipe.
-        """
-    ).strip()
 
+def __getattr__(name: str) -> Any:
+    model = _LAZY_SCHEMAS.get(name)
+    if model is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = _schema_json(model)
+    globals()[name] = value
+    return value
 
-def build_user_prompt(*, context_json: str) -> str:
-    """Embed the context into the user prompt."""
 
-    return dedent(
-        f"""
+# dedent() blanks whitespace-only lines before measuring the margin.
+_WHITESPACE_ONLY_LINES = re.compile(r"^[ \t]+$", re.MULTILINE)
+# A non-blank line indented less than the templates' 8-space margin.
+_MARGIN_BREAK = re.compile(r"\n(?! {8})[ \t]*\S")
+
+
+def _prompt_template(text: str, **constants: str) -> str:
+    """Prepare a prompt template once, matching what ``dedent(...).strip()`` produced per call.
+
+    ``constants`` are inlined with their braces escaped for ``str.format``. The
+    templates embed multi-line JSON whose closing brace sits in column 0, so
+    dedent never found a common margin; only whitespace-only lines changed.
+    """
+
+    for name, value in constants.items():
+        text = text.replace("{" + name + "}", value.replace("{", "{{").replace("}", "}}"))
+    return _WHITESPACE_ONLY_LINES.sub("", text).strip()
+
+
+def _render(template: str, **values: str) -> str:
+    """Fill a prepared template, blanking any whitespace-only lines the values introduce as dedent did."""
+
+    text = template.format(**values)
+    if any("\n" in value or not value.strip() for value in values.values()):
+        text = _WHITESPACE_ONLY_LINES.sub("", text)
+    return text
+
+
+_SYSTEM_PROMPT = dedent(
+    """
+    You are a world-class diabetes meal planning assistant. Your primary goal is to craft low-glycemic impact, nutrient-balanced, single-serving recipes.
+    You MUST ALWAYS produce output that can be parsed as JSON matching the provided schema.
+    The `ingredients` and `steps` arrays in your response MUST NOT be empty.
+    If the user's request is too vague to create a full recipe, you MUST ask for more details instead of returning an empty recipe.
+    """
+).strip()
+
+# Prompt bodies keep their 8-space indent: that is what has always reached the
+# model (see _prompt_template).
+_USER_PROMPT_TEXT = """
         Below is the user context you must consider:
 
         {context_json}
@@ -143,34 +178,22 @@ def build_user_prompt(*, context_json: str) -> str:
         }}
         ```
         """
-    ).strip()
-
-
-def build_input_validation_prompts(
-    *,
-    question_key: str,
-    question_prompt: str,
-    user_answer: str,
-    required: bool,
-) -> tuple[str, str]:
-    """Return system and user prompts instructing the LLM to validate input."""
-
-    system_prompt = dedent(
-        """
-        You are a validation assistant helping gather diabetes context. Always reply
-        with JSON that matches the provided schema. Do not include explanatory text
-        outside of JSON. Evaluate whether the user's answer satisfies the question.
-        """
-    ).strip()
-
-    requirement_label = "required" if required else "optional"
-    answer_literal = json.dumps(user_answer)
-
-    user_prompt = dedent(
-        f"""
+_USER_PROMPT_TPL = _prompt_template(_USER_PROMPT_TEXT)
+# A single-line context leaves the template's own indentation as the common margin.
+_USER_PROMPT_FLAT_TPL = dedent(_USER_PROMPT_TEXT).strip()
+
+_VALIDATION_SYSTEM_PROMPT = dedent(
+    """
+    You are a validation assistant helping gather diabetes context. Always reply
+    with JSON that matches the provided schema. Do not include explanatory text
+    outside of JSON. Evaluate whether the user's answer satisfies the question.
+    """
+).strip()
+
+_VALIDATION_PROMPT_TEXT = """
         You must output JSON that conforms to this schema:
 
-        {QUESTION_EVALUATION_SCHEMA}
+        {schema}
 
         Field expectations:
         - question: Echo the identifier for the question being evaluated. Use one of
@@ -224,26 +247,18 @@ def build_input_validation_prompts(
 
         Provide only JSON.
         """
-    ).strip()
 
-    return system_prompt, user_prompt
+_PROFILE_SYSTEM_PROMPT = dedent(
+    """
+    You help users update their diabetes health profile. Always reply with JSON
+    that matches the provided schema. Do not include any text outside of JSON.
+    """
+).strip()
 
-
-def build_profile_update_prompts(*, profile_json: str, user_request: str | None = None) -> tuple[str, str]:
-    system_prompt = dedent(
-        """
-        You help users update their diabetes health profile. Always reply with JSON
-        that matches the provided schema. Do not include any text outside of JSON.
-        """
-    ).strip()
-
-    user_request_literal = json.dumps(user_request or "")
-
-    user_prompt = dedent(
-        f"""
+_PROFILE_PROMPT_TEXT = """
         You must output JSON that conforms to this schema:
 
-        {PROFILE_UPDATE_SCHEMA}
+        {schema}
 
         Specialisation:
         - Use the following existing profile data as context when evaluating updates:
@@ -271,9 +286,61 @@ def build_profile_update_prompts(*, profile_json: str, user_request: str | None
 
         Provide only JSON.
         """
-    ).strip()
 
-    return system_prompt, user_prompt
+
+@lru_cache(maxsize=1)
+def _validation_prompt_template() -> str:
+    return _prompt_template(_VALIDATION_PROMPT_TEXT, schema=_schema_json(QuestionEvaluation))
+
+
+@lru_cache(maxsize=1)
+def _profile_prompt_template() -> str:
+    return _prompt_template(_PROFILE_PROMPT_TEXT, schema=_schema_json(ProfileUpdateResponse))
+
+
+def build_system_prompt() -> str:
+    """Return the system prompt guiding the model to emit structured JSON."""
+
+    return _SYSTEM_PROMPT
+
+
+def build_user_prompt(*, context_json: str) -> str:
+    """Embed the context into the user prompt."""
+
+    if "\n" not in context_json:
+        return _render(_USER_PROMPT_FLAT_TPL, context_json=context_json)
+    if _MARGIN_BREAK.search(context_json):
+        return _render(_USER_PROMPT_TPL, context_json=context_json)
+    # Every context line is indented as deep as the template, so dedent strips both.
+    return dedent(_USER_PROMPT_TEXT.format(context_json=context_json)).strip()
+
+
+def build_input_validation_prompts(
+    *,
+    question_key: str,
+    question_prompt: str,
+    user_answer: str,
+    required: bool,
+) -> tuple[str, str]:
+    """Return system and user prompts instructing the LLM to validate input."""
+
+    user_prompt = _render(
+        _validation_prompt_template(),
+        question_key=question_key,
+        question_prompt=question_prompt,
+        requirement_label="required" if required else "optional",
+        answer_literal=json.dumps(user_answer),
+    )
+    return _VALIDATION_SYSTEM_PROMPT, user_prompt
+
+
+def build_profile_update_prompts(*, profile_json: str, user_request: str | None = None) -> tuple[str, str]:
+    user_prompt = _render(
+        _profile_prompt_template(),
+        profile_json=profile_json,
+        user_request_literal=json.dumps(user_request or ""),
+    )
+    return _PROFILE_SYSTEM_PROMPT, user_prompt
 
 
 __all__ = [
@@ -2,6 +2,35 @@
 
 from __future__ import annotations
 
+import json
+from typing import Any
+
+try:  # orjson is optional; stdlib json is the fallback
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+
+def json_loads(raw: str | bytes) -> Any:
+    """Parse *raw* JSON, using orjson when available.
+
+    Decode errors raise :class:`json.JSONDecodeError` either way, since
+    ``orjson.JSONDecodeError`` subclasses it.
+    """
+
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def json_dumps_indented(payload: Any) -> str:
+    """Serialise *payload* as JSON indented by two spaces."""
+
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(payload, indent=2)
+
+
 def strip_json_code_fence(raw: str) -> str:
     """Return *raw* with leading/trailing JSON code fences removed.
 
@@ -44,6 +73,6 @@ def strip_json_code_fence(raw: str) -> str:
     return inner
 
 
-__all__ = ["strip_json_code_fence"]
+__all__ = ["json_dumps_indented", "json_loads", "strip_json_code_fence"]
 
 
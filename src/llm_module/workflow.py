@@ -157,7 +157,10 @@ class LLMOrchestrator:
         user_prompt = build_user_prompt(context_json=context_json)
 
         # Set up structured output format
-        request_context.response_format = FOOD_ANALYSIS_SCHEMA
+        if request_context.response_format is not FOOD_ANALYSIS_SCHEMA:
+            request_context = request_context.model_copy(
+                update={"response_format": FOOD_ANALYSIS_SCHEMA}
+            )
 
         return self._client.generate_structured(
             prompt=user_prompt,
@@ -224,7 +227,7 @@ def ensure_user_health_profile(
         return HealthInfo.parse_obj(data)
 
     def save(health_info: HealthInfo) -> None:
-        payload = json.loads(health_info.model_dump_json(indent=2, exclude_none=False))
+        payload = health_info.model_dump(mode="json", exclude_none=False)
 
         try:
             if profile_path.exists():
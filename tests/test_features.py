@@ -0,0 +1,85 @@
+"""Tests for the meal-level feature table built from meal segments."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+PIPELINE = ROOT / "prediction_modelling"
+if str(PIPELINE) not in sys.path:
+    sys.path.insert(0, str(PIPELINE))
+
+from cgmacros_pipeline.features import build_meal_level_dataset
+
+X_COLUMNS = [
+    "patient_id", "meal_bucket", "baseline_avg_glucose", "meal_calories", "carbs_g", "protein_g",
+    "fat_g", "fiber_g", "amount_consumed", "Age", "Gender", "Body weight", "Height",
+    "activity_cal_mean", "mets_mean",
+]
+
+
+def _row(pid, meal, meal_type, rel, glucose=np.nan, delta=np.nan, **extra) -> dict:
+    return {
+        "patient_id": pid, "meal_index": meal, "meal_timestamp": f"2020-05-01 0{meal}:00:00",
+        "meal_type": meal_type, "rel_minute": rel, "glucose_mgdl": glucose, "delta_glucose_mgdl": delta,
+        "activity_cal": np.nan, "mets": np.nan, "meal_calories": np.nan, "carbs_g": np.nan,
+        "protein_g": np.nan, "fat_g": np.nan, "fiber_g": np.nan, "amount_consumed": np.nan,
+        "Age": 41, "Gender": np.nan, "Body weight ": 80.5, "Height ": 170.0, **extra,
+    }
+
+
+def _segments() -> pd.DataFrame:
+    rows = [
+        # Breakfast: baseline from -30..-1; later nutrition rows lose to the earliest one.
+        _row(1, 0, "Breakfast", 120, delta=30.0, meal_calories=999.0, activity_cal=4.0),
+        _row(1, 0, "Breakfast", -50, glucose=200.0, mets=1.0),
+        _row(1, 0, "Breakfast", -20, glucose=100.0, meal_calories=450.0, carbs_g=60.0, protein_g=20.0,
+             fat_g=15.0, fiber_g=8.0, amount_consumed=1.0, Gender="F", activity_cal=2.0),
+        _row(1, 0, "Breakfast", -10, glucose=110.0, mets=3.0),
+        _row(1, 0, "Breakfast", 1, delta=0.0),
+        _row(1, 0, "Breakfast", 61, delta=30.0, Gender="M"),
+        # "lunch box" buckets to Lunch; baseline falls back to -60..-1, one post point fills the curve.
+        _row(1, 1, "lunch box", -45, glucose=90.0, carbs_g="35", **{"Height ": np.nan}),
+        _row(1, 1, "lunch box", 30, delta=12.0, **{"Height ": np.nan}),
+        # Supper has no pre-meal glucose and is skipped.
+        _row(2, 0, "Supper", 10, delta=5.0),
+        # A snack with no post-meal deltas is skipped.
+        _row(2, 1, "Snack", -5, glucose=140.0),
+        _row(2, 1, "Snack", 5, glucose=150.0),
+        # Unrecognised meal types are dropped.
+        _row(2, 2, "other", -5, glucose=120.0),
+        _row(2, 2, "other", 5, delta=1.0),
+    ]
+    return pd.DataFrame(rows)
+
+
+def test_meal_level_dataset_columns_and_values():
+    X, Y = build_meal_level_dataset(_segments())
+
+    assert list(X.columns) == X_COLUMNS
+    expected = pd.DataFrame(
+        [
+            ["1", "Breakfast", 105.0, 450.0, 60.0, 20.0, 15.0, 8.0, 1.0, 41.0, "F", 80.5, 170.0, 3.0, 2.0],
+            ["1", "Lunch", 90.0, np.nan, 35.0, np.nan, np.nan, np.nan, np.nan, 41.0, "Unknown", 80.5,
+             np.nan, np.nan, np.nan],
+        ],
+        columns=X_COLUMNS,
+    )
+    pd.testing.assert_frame_equal(X, expected, check_dtype=False)
+
+    assert Y.shape == (2, 120)
+    np.testing.assert_allclose(Y[0], np.concatenate([np.arange(60) * 0.5, np.full(60, 30.0)]))
+    np.testing.assert_allclose(Y[1], np.full(120, 12.0))
+
+
+def test_meal_level_dataset_without_usable_meals():
+    for segments in (_segments().query("patient_id == 2"), _segments().iloc[:0]):
+        X, Y = build_meal_level_dataset(segments)
+
+        assert list(X.columns) == X_COLUMNS
+        assert len(X) == 0
+        assert Y.shape == (0, 120)
@@ -0,0 +1,116 @@
+"""Behavioural tests for the llm_module data models."""
+
+from __future__ import annotations
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from llm_module.models import (
+    FoodAnalysisResponse,
+    FoodIngredient,
+    HealthInfo,
+    Recipe,
+    RecipeIngredient,
+)
+
+
+def test_food_ingredient_is_recipe_ingredient():
+    ingredient = FoodIngredient(name="rice", amount="1 cup")
+
+    assert FoodIngredient is RecipeIngredient
+    assert isinstance(ingredient, RecipeIngredient)
+    assert isinstance(ingredient, FoodIngredient)
+
+
+def test_ingredient_round_trips_through_model_dump():
+    ingredient = RecipeIngredient(name="oats", amount="40 g")
+
+    assert ingredient.model_dump() == {"name": "oats", "amount": "40 g"}
+    assert RecipeIngredient.model_validate(ingredient.model_dump()) == ingredient
+
+
+@pytest.mark.parametrize(
+    ("payload", "amount"),
+    [
+        ({"name": "egg", "amount": 5}, "5"),
+        ({"name": "egg", "amount": 2.5}, "2.5"),
+        ({"name": "egg", "quantity": 2}, "2"),
+        ({"name": "egg", "quantity": "two"}, "two"),
+        ({"name": "egg", "amount_g": 50}, "50 g"),
+        ({"name": "egg", "amount_g": "a handful"}, "a handful"),
+        # amount_g takes precedence over quantity, as with the original validators.
+        ({"name": "egg", "quantity": 2, "amount_g": 3}, "3 g"),
+        ({"name": "egg", "amount": "1", "amount_g": 3}, "1"),
+    ],
+)
+def test_ingredient_amount_coercion(payload, amount):
+    assert RecipeIngredient.model_validate(payload).amount == amount
+    assert FoodIngredient(**payload).amount == amount
+
+
+def test_ingredient_coercion_leaves_payload_untouched():
+    payload = {"name": "egg", "amount_g": 50}
+
+    RecipeIngredient.model_validate(payload)
+
+    assert payload == {"name": "egg", "amount_g": 50}
+
+
+def test_ingredient_without_amount_is_rejected():
+    with pytest.raises(ValidationError):
+        RecipeIngredient.model_validate({"name": "egg"})
+
+
+def test_recipe_builds_ingredient_models_from_legacy_payloads():
+    recipe = Recipe.model_validate(
+        {
+            "food_name": "Omelette",
+            "ingredients": [
+                {"name": "egg", "quantity": 2},
+                {"name": "butter", "amount_g": 10},
+                RecipeIngredient(name="salt", amount="pinch"),
+            ],
+            "steps": ["whisk", {"instruction": "cook"}],
+        }
+    )
+
+    assert all(isinstance(item, RecipeIngredient) for item in recipe.ingredients)
+    assert [item.amount for item in recipe.ingredients] == ["2", "10 g", "pinch"]
+    assert recipe.steps == ["whisk", "cook"]
+    assert recipe.food_name == "Omelette"
+
+
+def test_legacy_food_payload_is_wrapped_in_recipe():
+    response = FoodAnalysisResponse.model_validate(
+        {"food": {"food_name": "Porridge", "ingredients": [{"name": "oats", "amount_g": 40}]}}
+    )
+
+    assert response.recipe.title == "Porridge"
+    assert response.recipe.ingredients == [RecipeIngredient(name="oats", amount="40 g")]
+
+
+def test_ingredient_schema_matches_field_descriptions():
+    schema = RecipeIngredient.model_json_schema()
+
+    assert schema["required"] == ["name", "amount"]
+    assert schema["properties"]["name"]["description"] == "Ingredient name"
+    assert schema["properties"]["amount"]["description"] == "Ingredient amount with units"
+
+
+def test_health_info_last_updated_is_naive_utc():
+    before = datetime.now(timezone.utc).replace(tzinfo=None)
+    stamp = HealthInfo().last_updated
+    after = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    assert stamp.tzinfo is None
+    assert before <= stamp <= after
+    assert "+" not in HealthInfo().model_dump_json()
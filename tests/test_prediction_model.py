@@ -0,0 +1,309 @@
+"""Equivalence tests for PredictionModel's predict backends."""
+
+from __future__ import annotations
+
+import base64
+import io
+import json
+import sys
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.impute import SimpleImputer
+from sklearn.multioutput import MultiOutputRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import prediction_model
+from prediction_model import PredictionModel
+
+NUMERIC = [
+    "baseline_avg_glucose", "meal_calories", "carbs_g", "protein_g", "fat_g", "fiber_g",
+    "amount_consumed", "Age", "Body weight", "Height", "activity_cal_mean", "mets_mean",
+]
+CATEGORICAL = ["meal_bucket", "Gender"]
+MEALS = ["Breakfast", "Lunch", "Dinner", "Snacks"]
+
+
+def _random_features(rng: np.random.Generator, n: int) -> pd.DataFrame:
+    frame = pd.DataFrame({col: rng.uniform(0.0, 200.0, n) for col in NUMERIC})
+    frame["amount_consumed"] = rng.uniform(0.25, 1.0, n)
+    # Some gaps so the median imputer has work to do.
+    frame = frame.mask(rng.random(frame.shape) < 0.05)
+    frame["baseline_avg_glucose"] = rng.uniform(80.0, 160.0, n)
+    frame["meal_bucket"] = rng.choice(MEALS, n)
+    frame["Gender"] = rng.choice(["Male", "Female"], n)
+    return frame
+
+
+def _training_data(seed: int = 0) -> tuple[pd.DataFrame, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    X = _random_features(rng, 240)
+    minutes = np.arange(1, 121)
+    carbs = X["carbs_g"].fillna(60.0).to_numpy()[:, None]
+    Y = 0.4 * carbs * np.sin(np.pi * minutes / 120.0) + rng.normal(0.0, 3.0, (len(X), 120))
+    return X, Y
+
+
+def _fit_pipeline(seed: int = 0) -> Pipeline:
+    """Small forest with train.py's preprocess layout and 120 curve outputs."""
+    X, Y = _training_data(seed)
+
+    preprocess = ColumnTransformer(
+        transformers=[
+            ("num", SimpleImputer(strategy="median"), NUMERIC),
+            (
+                "cat",
+                Pipeline(
+                    steps=[
+                        ("imp", SimpleImputer(strategy="most_frequent")),
+                        ("oh", OneHotEncoder(handle_unknown="ignore", sparse_output=False, dtype=np.float32)),
+                    ]
+                ),
+                CATEGORICAL,
+            ),
+        ]
+    )
+    rf = RandomForestRegressor(n_estimators=12, max_depth=7, min_samples_leaf=3, random_state=seed, n_jobs=1)
+    pipe = Pipeline([("preprocess", preprocess), ("reg", rf)])
+    pipe.fit(X, Y)
+    return pipe
+
+
+@pytest.fixture(scope="module")
+def artifact(tmp_path_factory) -> Path:
+    out = tmp_path_factory.mktemp("model")
+    joblib.dump(_fit_pipeline(), out / "model_multioutput.pkl")
+    return out
+
+
+def _model(artifact: Path, tmp_path: Path, **kwargs) -> PredictionModel:
+    return PredictionModel(
+        artifact,
+        output_dir=tmp_path / "out",
+        save_plot=False,
+        save_json=False,
+        cache_models=False,
+        **kwargs,
+    )
+
+
+def _payloads(n: int, seed: int = 1) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    frame = _random_features(rng, n)
+    payloads = []
+    for record in frame.to_dict(orient="records"):
+        record = {k: (None if isinstance(v, float) and np.isnan(v) else v) for k, v in record.items()}
+        record["meal_type"] = record.pop("meal_bucket")
+        payloads.append(record)
+    return payloads
+
+
+def _rows(model: PredictionModel, payloads: list[dict]) -> np.ndarray:
+    rows = np.empty((len(payloads), len(model.expected_columns)), dtype=object)
+    for i, payload in enumerate(payloads):
+        model._payload_to_row(payload, rows, i)
+    model._coerce_rows(rows)
+    return rows
+
+
+def _reference(model: PredictionModel, rows: np.ndarray) -> np.ndarray:
+    """The fitted sklearn pipeline, untouched by any fast path."""
+    return model._model.predict(model._frame(rows))
+
+
+def test_default_backend_is_sklearn(artifact, tmp_path):
+    model = _model(artifact, tmp_path)
+    assert model._ort is None and model._numba is None and model._leaf is None
+    # Nothing on the default path needs the padded per-tree arrays.
+    assert model._packed is None
+
+    rows = _rows(model, _payloads(20))
+    np.testing.assert_allclose(model._predict_matrix(rows), _reference(model, rows), rtol=0, atol=1e-9)
+
+
+def test_onnx_backend_matches_sklearn(artifact, tmp_path):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("skl2onnx")
+    model = _model(artifact, tmp_path, use_onnx=True)
+    assert model._ort is not None
+
+    rows = _rows(model, _payloads(20))
+    np.testing.assert_allclose(model._predict_matrix(rows), _reference(model, rows), rtol=1e-4, atol=1e-3)
+
+
+def test_onnx_sibling_skips_conversion(artifact, tmp_path, monkeypatch):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("skl2onnx")
+    onnx_path = _model(artifact, tmp_path).convert_to_onnx(tmp_path / "model_multioutput.onnx")
+    model_dir = tmp_path / "artifact"
+    model_dir.mkdir()
+    (model_dir / "model_multioutput.pkl").write_bytes((artifact / "model_multioutput.pkl").read_bytes())
+    onnx_path.rename(model_dir / "model_multioutput.onnx")
+
+    def _no_conversion(self):
+        raise AssertionError("the saved .onnx should be loaded instead of converting")
+
+    monkeypatch.setattr(PredictionModel, "_onnx_bytes", _no_conversion)
+    model = _model(model_dir, tmp_path, use_onnx=True)
+    assert model._ort is not None
+
+    rows = _rows(model, _payloads(5))
+    np.testing.assert_allclose(model._predict_matrix(rows), _reference(model, rows), rtol=1e-4, atol=1e-3)
+
+
+def test_numba_backend_matches_sklearn(artifact, tmp_path):
+    pytest.importorskip("numba")
+    model = _model(artifact, tmp_path, use_numba=True)
+    assert model._numba is not None
+
+    rows = _rows(model, _payloads(40))
+    Xt = model._transform_fast(rows, model._fast)
+    np.testing.assert_allclose(model._numba(Xt), model._reg.predict(Xt), rtol=0, atol=1e-6)
+    np.testing.assert_allclose(model._predict_matrix(rows), _reference(model, rows), rtol=0, atol=1e-6)
+
+
+def test_leaf_table_matches_sklearn(artifact, tmp_path):
+    model = _model(artifact, tmp_path, use_leaf_table=True)
+    assert model._leaf is not None
+
+    rows = _rows(model, _payloads(40))
+    Xt = model._transform_fast(rows, model._fast)
+    np.testing.assert_allclose(model._leaf(Xt), model._reg.predict(Xt), rtol=0, atol=1e-9)
+    np.testing.assert_allclose(model._predict_matrix(rows), _reference(model, rows), rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize("backend", ["use_leaf_table", "use_numba"])
+def test_quantized_leaves_stay_within_documented_bound(artifact, tmp_path, backend):
+    if backend == "use_numba":
+        pytest.importorskip("numba")
+    model = _model(artifact, tmp_path, quantize_leaves=True, **{backend: True})
+    run = model._leaf if backend == "use_leaf_table" else model._numba
+    assert run is not None
+    assert model._packed[4].dtype == np.int16
+
+    rows = _rows(model, _payloads(200))
+    Xt = model._transform_fast(rows, model._fast)
+    expected = model._reg.predict(Xt)
+    err = np.abs(run(Xt) - expected).max()
+
+    # Half a rounding step per tree, averaged over the forest (see _pack_forest),
+    # plus float32 slack for the leaf-table gather.
+    leaf_max = np.array([np.abs(t.tree_.value).max() for t in model._reg.estimators_])
+    bound = float(np.mean(leaf_max / 32760.0 / 2.0))
+    assert bound <= leaf_max.max() / 65520.0
+    assert err <= bound + 1e-7 * np.abs(expected).max() * len(leaf_max)
+    assert err < 0.01
+
+
+def test_inputs_used_maps_missing_values_to_none(artifact, tmp_path):
+    model = _model(artifact, tmp_path)
+    payload = {"baseline_avg_glucose": 110, "meal_type": "dinner", "carbs_g": "n/a", "Gender": "female"}
+
+    row, _ = model._payload_to_array(payload)
+    echoed = model._inputs_used(row[0])
+    assert echoed["carbs_g"] is None and echoed["Age"] is None
+    assert echoed["baseline_avg_glucose"] == 110.0
+    assert echoed["meal_bucket"] == "Dinner" and echoed["Gender"] == "Female"
+    # Valid JSON for the stdlib encoder too (it would write a bare NaN otherwise).
+    json.dumps(echoed, allow_nan=False)
+
+    result, _, _ = model.predict(payload)
+    assert json.loads(result)["inputs_used"] == echoed
+    (item,) = json.loads(model.predict_many([payload]))["items"]
+    assert item["inputs_used"] == echoed
+
+
+def test_default_plot_backend_is_matplotlib(artifact, tmp_path):
+    assert _model(artifact, tmp_path)._render_png is prediction_model._render_png_bytes
+
+
+@pytest.mark.parametrize("backend", ["matplotlib", "pillow"])
+def test_plot_backends_render_png(artifact, tmp_path, backend):
+    from PIL import Image
+
+    model = _model(artifact, tmp_path, plot_backend=backend)
+    payload = {"baseline_avg_glucose": 120, "meal_type": "lunch", "carbs_g": 60, "return_plot": True}
+    result = json.loads(model.predict(payload)[0])
+
+    png = base64.b64decode(result["png_base64"])
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    with Image.open(io.BytesIO(png)) as img:
+        img.verify()
+    with Image.open(io.BytesIO(png)) as img:
+        assert img.size == (800, 450)
+
+
+def test_prune_and_save_writes_a_loadable_smaller_forest(artifact, tmp_path):
+    model = _model(artifact, tmp_path)
+    X, Y = _training_data()
+
+    # alpha=0 refits the very same trees.
+    unpruned = model.prune_and_save(0.0, tmp_path / "alpha0", X, Y)
+    assert unpruned["nodes_after"] == unpruned["nodes_before"]
+    same = _model(tmp_path / "alpha0", tmp_path)
+    rows = _rows(model, _payloads(20))
+    np.testing.assert_allclose(same._predict_matrix(rows), model._predict_matrix(rows), rtol=0, atol=1e-9)
+
+    counts = model.prune_and_save(5.0, tmp_path / "pruned", X, Y)
+    assert counts["nodes_after"] < counts["nodes_before"]
+    pruned = _model(tmp_path / "pruned", tmp_path)
+    assert pruned._reg.ccp_alpha == 5.0
+    curves = pruned._predict_matrix(_rows(pruned, _payloads(20)))
+    assert curves.shape == (20, 120) and np.isfinite(curves).all()
+
+
+def test_transform_fast_matches_column_transformer(artifact, tmp_path):
+    model = _model(artifact, tmp_path)
+    assert model._fast is not None
+
+    payloads = _payloads(60)
+    payloads[0]["Gender"] = None  # missing -> most_frequent
+    payloads[1]["Gender"] = "nonbinary"  # unseen -> all-zero one-hot block
+    payloads[2].update({"carbs_g": None, "Age": "unknown", "Height": float("nan")})
+    rows = _rows(model, payloads)
+
+    ref = model._preprocess.transform(model._frame(rows))
+    fast = model._transform_fast(rows, model._fast)
+    assert fast.dtype == np.float32 and fast.flags.c_contiguous
+    np.testing.assert_allclose(fast, np.asarray(ref, dtype=np.float32), rtol=0, atol=0)
+
+
+def test_cached_pipeline_keeps_per_instance_parallelism(tmp_path, monkeypatch):
+    X, Y = _training_data(3)
+    pipe = _fit_pipeline(3)
+    pipe.steps[-1] = (
+        "reg",
+        MultiOutputRegressor(RandomForestRegressor(n_estimators=2, max_depth=3, random_state=0, n_jobs=1)),
+    )
+    pipe.fit(X, Y)
+    joblib.dump(pipe, tmp_path / "model_multioutput.pkl")
+    monkeypatch.setattr(prediction_model, "_MODEL_CACHE", {})
+
+    common = dict(output_dir=tmp_path / "out", save_plot=False, save_json=False)
+    wide = PredictionModel(tmp_path, n_jobs_targets=2, n_jobs_trees=2, **common)
+    narrow = PredictionModel(tmp_path, n_jobs_targets=1, n_jobs_trees=1, **common)
+
+    cached = prediction_model._MODEL_CACHE[(tmp_path / "model_multioutput.pkl").resolve()]
+    assert cached.named_steps["reg"].n_jobs is None
+    assert {est.n_jobs for est in cached.named_steps["reg"].estimators_} == {1}
+
+    assert wide._reg.n_jobs == 2 and wide._model.named_steps["reg"] is wide._reg
+    assert {est.n_jobs for est in wide._reg.estimators_} == {2}
+    assert wide._reg_small.n_jobs == 1
+    assert narrow._reg.n_jobs == 1 and narrow._reg_small is narrow._reg
+    assert {est.n_jobs for est in narrow._reg.estimators_} == {1}
+
+    rows = _rows(wide, _payloads(40))
+    expected = cached.predict(wide._frame(rows))
+    np.testing.assert_allclose(wide._predict_matrix(rows), expected, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(narrow._predict_matrix(rows), expected, rtol=0, atol=1e-9)
@@ -0,0 +1,221 @@
+"""HTTP-layer tests for the REST providers, served by httpx.MockTransport."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Optional
+
+import httpx
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from llm_module.clients import LLMClientBase, LLMClientError, default_parser
+from llm_module.models import FoodAnalysisResponse, LLMRequestContext
+from llm_module.providers import _http
+from llm_module.providers.huggingface_provider import HuggingFaceClient
+from llm_module.providers.lmstudio import LMStudioClient
+
+RECIPE_JSON = json.dumps(
+    {"recipe": {"title": "Lentil Soup", "ingredients": [{"name": "lentils", "amount": "80 g"}], "steps": ["Simmer."]}}
+)
+
+
+def _context(**kw) -> LLMRequestContext:
+    return LLMRequestContext(model_name="local-model", **kw)
+
+
+def _lmstudio_reply(content: str) -> dict:
+    return {"choices": [{"message": {"role": "assistant", "content": content}}]}
+
+
+class _Recorder:
+    """MockTransport handler that records requests and replies with a fixed response."""
+
+    def __init__(self, status: int = 200, body=None) -> None:
+        self.status = status
+        self.body = body
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return httpx.Response(self.status, json=self.body)
+
+    @property
+    def payload(self) -> dict:
+        return json.loads(self.requests[-1].content)
+
+
+def _lmstudio(handler, **kw) -> LMStudioClient:
+    return LMStudioClient(
+        parser=default_parser(),
+        base_url="http://lmstudio.test/v1/",
+        session=httpx.Client(transport=httpx.MockTransport(handler)),
+        async_session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        **kw,
+    )
+
+
+def _huggingface(handler, **kw) -> HuggingFaceClient:
+    return HuggingFaceClient(
+        parser=default_parser(),
+        endpoint_url="http://tgi.test/generate",
+        api_token="secret",
+        session=httpx.Client(transport=httpx.MockTransport(handler)),
+        async_session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        **kw,
+    )
+
+
+def test_lmstudio_complete_posts_chat_payload():
+    handler = _Recorder(body=_lmstudio_reply("hello"))
+    client = _lmstudio(handler)
+    context = _context(extra_options={"temperature": 0.2}, response_format={"type": "json_object"})
+
+    text = client.complete(prompt="hi", request_context=context, system_prompt="be brief")
+
+    assert text == "hello"
+    request = handler.requests[-1]
+    assert str(request.url) == "http://lmstudio.test/v1/chat/completions"
+    assert handler.payload == {
+        "model": "local-model",
+        "messages": [{"role": "system", "content": "be brief"}, {"role": "user", "content": "hi"}],
+        "temperature": 0.2,
+        "response_format": {"type": "json_object"},
+    }
+
+
+def test_lmstudio_acomplete_matches_complete():
+    handler = _Recorder(body=_lmstudio_reply("hello"))
+    client = _lmstudio(handler)
+
+    sync_text = client.complete(prompt="hi", request_context=_context())
+    sync_payload = handler.payload
+    async_text = asyncio.run(client.acomplete(prompt="hi", request_context=_context()))
+
+    assert async_text == sync_text == "hello"
+    assert handler.payload == sync_payload
+    assert str(handler.requests[-1].url) == "http://lmstudio.test/v1/chat/completions"
+
+
+def test_huggingface_complete_and_acomplete():
+    handler = _Recorder(body=[{"generated_text": "done"}])
+    client = _huggingface(handler)
+    context = _context(extra_options={"temperature": 0.1})
+
+    assert client.complete(prompt="hi", request_context=context, system_prompt="sys") == "done"
+    request = handler.requests[-1]
+    assert request.headers["Authorization"] == "Bearer secret"
+    assert handler.payload == {"inputs": "sys\n\nhi", "parameters": {"max_new_tokens": 512, "temperature": 0.1}}
+
+    assert asyncio.run(client.acomplete(prompt="hi", request_context=context)) == "done"
+    assert handler.payload["inputs"] == "hi"
+
+
+@pytest.mark.parametrize("factory", [_lmstudio, _huggingface])
+def test_http_errors_raise_client_error(factory):
+    client = factory(_Recorder(status=503, body={"error": "busy"}))
+
+    with pytest.raises(LLMClientError):
+        client.complete(prompt="hi", request_context=_context())
+    with pytest.raises(LLMClientError):
+        asyncio.run(client.acomplete(prompt="hi", request_context=_context()))
+
+
+@pytest.mark.parametrize("factory", [_lmstudio, _huggingface])
+def test_transport_errors_raise_client_error(factory):
+    def refuse(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("refused", request=request)
+
+    client = factory(refuse)
+
+    with pytest.raises(LLMClientError):
+        client.complete(prompt="hi", request_context=_context())
+    with pytest.raises(LLMClientError):
+        asyncio.run(client.acomplete(prompt="hi", request_context=_context()))
+
+
+def test_acomplete_caps_requests_in_flight():
+    in_flight = 0
+    peak = 0
+
+    async def slow(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json=_lmstudio_reply("ok"))
+
+    client = LMStudioClient(
+        parser=default_parser(),
+        async_session=httpx.AsyncClient(transport=httpx.MockTransport(slow)),
+        max_concurrency=2,
+    )
+
+    async def run() -> list:
+        return await asyncio.gather(*(client.acomplete(prompt=str(i), request_context=_context()) for i in range(6)))
+
+    assert asyncio.run(run()) == ["ok"] * 6
+    assert peak == 2
+    # A fresh event loop gets its own semaphore rather than one bound to the old loop.
+    assert asyncio.run(run()) == ["ok"] * 6
+
+
+def test_agenerate_structured_parses_fenced_json():
+    handler = _Recorder(body=_lmstudio_reply(f"```json\n{RECIPE_JSON}\n```"))
+    client = _lmstudio(handler)
+    context = _context(response_format={"type": "json_object"})
+
+    sync_result = client.generate_structured(prompt="soup", request_context=context)
+    async_result = asyncio.run(client.agenerate_structured(prompt="soup", request_context=context))
+
+    assert isinstance(async_result, FoodAnalysisResponse)
+    assert async_result == sync_result
+    assert async_result.recipe.title == "Lentil Soup"
+    assert async_result.recipe.ingredients[0].amount == "80 g"
+
+
+def test_default_acomplete_runs_complete_in_a_thread():
+    class _Echo(LLMClientBase):
+        def complete(self, *, prompt: str, request_context: LLMRequestContext,
+                     system_prompt: Optional[str] = None) -> str:
+            return f"{system_prompt}:{prompt}"
+
+    client = _Echo(parser=default_parser())
+
+    assert asyncio.run(client.acomplete(prompt="p", request_context=_context(), system_prompt="s")) == "s:p"
+
+
+def test_providers_share_one_pooled_client():
+    first = LMStudioClient(parser=default_parser())
+    second = HuggingFaceClient(parser=default_parser(), endpoint_url="http://tgi.test")
+
+    assert first._session is second._session is _http.shared_client(True)
+    assert _http.shared_client(False) is not _http.shared_client(True)
+    assert first._async_session is None
+
+
+def test_async_client_is_created_on_first_acomplete(monkeypatch):
+    handler = _Recorder(body=_lmstudio_reply("ok"))
+    created = []
+
+    def fake_new_async_client(*, http2: bool = True, timeout: float = 60) -> httpx.AsyncClient:
+        created.append((http2, timeout))
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    monkeypatch.setattr(_http, "new_async_client", fake_new_async_client)
+    client = LMStudioClient(parser=default_parser(), timeout=5, http2=False)
+
+    assert created == []
+    asyncio.run(client.acomplete(prompt="hi", request_context=_context()))
+    asyncio.run(client.acomplete(prompt="hi", request_context=_context()))
+
+    assert created == [(False, 5)]
+    assert len(handler.requests) == 2
@@ -0,0 +1,101 @@
+"""Tests that the prepared prompt templates render what the per-call dedent did."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from textwrap import dedent
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from llm_module import responses
+from llm_module.models import FoodAnalysisResponse, ProfileUpdateResponse, QuestionEvaluation
+
+CONTEXTS = [
+    "",
+    '{"health_info": {"age": 34}, "meal_intent": {"desired_food": "ramen"}}',
+    json.dumps({"health_info": {"age": 34, "gender": "F"}, "notes": ["a", "b"]}, indent=2),
+    "line one\n    indented line\n\t\nline {with} braces",
+    "   ",
+    "\n",
+    # Indented at least as deep as the template, so dedent strips the margin from both.
+    "first\n          second\n\n        third",
+]
+ANSWERS = ["34", "", 'he said "{hi}"', "two\nlines", None]
+
+
+def _reference_user_prompt(context_json: str) -> str:
+    return dedent(responses._USER_PROMPT_TEXT.format(context_json=context_json)).strip()
+
+
+@pytest.mark.parametrize("context_json", CONTEXTS)
+def test_user_prompt_matches_dedent(context_json):
+    prompt = responses.build_user_prompt(context_json=context_json)
+
+    assert prompt == _reference_user_prompt(context_json)
+    assert prompt.startswith("Below is the user context you must consider:")
+    assert '"title": "Lemon Herb Baked Cod"' in prompt
+
+
+@pytest.mark.parametrize("required", [True, False])
+@pytest.mark.parametrize("answer", ANSWERS[:-1])
+@pytest.mark.parametrize("question_prompt", ["How old are you? {years}", "Age?\n   \n  in years"])
+def test_input_validation_prompts_match_dedent(answer, required, question_prompt):
+    system, user = responses.build_input_validation_prompts(
+        question_key="age",
+        question_prompt=question_prompt,
+        user_answer=answer,
+        required=required,
+    )
+
+    expected = dedent(
+        responses._VALIDATION_PROMPT_TEXT.format(
+            schema=responses.QUESTION_EVALUATION_SCHEMA,
+            question_key="age",
+            question_prompt=question_prompt,
+            requirement_label="required" if required else "optional",
+            answer_literal=json.dumps(answer),
+        )
+    ).strip()
+    assert user == expected
+    assert system.startswith("You are a validation assistant")
+    assert f"- User answer (verbatim): {json.dumps(answer)}" in user
+
+
+@pytest.mark.parametrize("user_request", ANSWERS)
+@pytest.mark.parametrize("profile_json", CONTEXTS)
+def test_profile_update_prompts_match_dedent(profile_json, user_request):
+    system, user = responses.build_profile_update_prompts(profile_json=profile_json, user_request=user_request)
+
+    expected = dedent(
+        responses._PROFILE_PROMPT_TEXT.format(
+            schema=responses.PROFILE_UPDATE_SCHEMA,
+            profile_json=profile_json,
+            user_request_literal=json.dumps(user_request or ""),
+        )
+    ).strip()
+    assert user == expected
+    assert system.startswith("You help users update their diabetes health profile.")
+
+
+@pytest.mark.parametrize(
+    ("name", "model"),
+    [
+        ("LLM_STUDIO_RESPONSE_SCHEMA", FoodAnalysisResponse),
+        ("QUESTION_EVALUATION_SCHEMA", QuestionEvaluation),
+        ("PROFILE_UPDATE_SCHEMA", ProfileUpdateResponse),
+    ],
+)
+def test_lazy_schema_constants(name, model):
+    assert getattr(responses, name) == json.dumps(model.model_json_schema(), indent=2)
+
+
+def test_unknown_module_attribute_raises():
+    with pytest.raises(AttributeError):
+        responses.NOT_A_SCHEMA
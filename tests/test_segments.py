@@ -0,0 +1,163 @@
+"""Tests for CGMacros meal segment extraction."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+PIPELINE = ROOT / "prediction_modelling"
+if str(PIPELINE) not in sys.path:
+    sys.path.insert(0, str(PIPELINE))
+
+from cgmacros_pipeline import segments
+
+
+def _patient_frame(seed: int, *, seconds: bool = False, dexcom: bool = False) -> pd.DataFrame:
+    """One day of CGMacros-like minute data with a handful of annotated meals."""
+    rng = np.random.default_rng(seed)
+    n = 1440
+    stamps = pd.date_range("2020-05-01 06:00", periods=n, freq="1min")
+    if seconds:
+        stamps = stamps + pd.to_timedelta(rng.integers(0, 50, n), unit="s")
+    glucose = np.round(110 + 30 * np.sin(np.arange(n) / 90) + rng.normal(0, 3, n), 1)
+    df = pd.DataFrame({"Timestamp": stamps})
+    if dexcom:
+        df["Dexcom GL"] = np.where(np.arange(n) % 5 == 0, glucose, np.nan)
+    df["Libre GL"] = np.where(np.arange(n) % 15 == 0, glucose, np.nan)
+    df["HR"] = 70
+    df["Calories (Activity)"] = np.round(rng.random(n) * 3, 3)
+    df["METs"] = np.where(rng.random(n) < 0.9, np.round(10 + rng.random(n), 2), np.nan)
+    meal = np.zeros(n, bool)
+    meal[[40, 300, 420, 700, 1000, 1400]] = True
+    types = np.array(["Breakfast", "Lunch", "Dinner", "Snacks"])
+    df["Meal Type"] = np.where(meal, types[rng.integers(0, 4, n)], None)
+    for col, lo, hi in (("Calories", 100, 900), ("Carbs", 5, 100), ("Protein", 5, 50),
+                        ("Fat", 5, 50), ("Fiber", 0, 20)):
+        df[col] = np.where(meal, rng.integers(lo, hi, n), np.nan)
+    df["Amount Consumed"] = np.where(meal, 100, np.nan)
+    df["Image path"] = "x"
+    # A gap in the recording, straddling the 420-minute meal's window.
+    return df.drop(index=range(380, 460))
+
+
+def _write_dataset(root: Path) -> Path:
+    base = root / "CGMacros"
+    for i, (seconds, dexcom) in enumerate([(False, False), (False, True), (True, False)], start=1):
+        folder = base / f"CGMacros-00{i}"
+        folder.mkdir(parents=True)
+        _patient_frame(i, seconds=seconds, dexcom=dexcom).to_csv(folder / f"{folder.name}.csv", index=False)
+    return base
+
+
+# Per-meal summaries of the original list-of-frames extraction on _write_dataset():
+# (patient, meal, meal time, rows, first/last rel_minute, glucose sum, delta sum,
+# missing glucose rows, meal type, carbs).
+EXPECTED = {
+    "1min": [
+        ("001", 0, "2020-05-01 06:40:00", 161, -40, 120, 21286.2, 1068.893, 0, "Lunch", 7.0),
+        ("001", 1, "2020-05-01 11:00:00", 140, -60, 79, 14302.1, -652.7, 0, "Lunch", 87.0),
+        ("001", 2, "2020-05-01 17:40:00", 181, -60, 120, 24171.2, -662.0, 0, "Dinner", 49.0),
+        ("001", 3, "2020-05-01 22:40:00", 181, -60, 120, 16085.9, 1220.973, 0, "Lunch", 60.0),
+        ("001", 4, "2020-05-02 05:20:00", 100, -60, 39, 11679.5, 139.5, 0, "Snacks", 63.0),
+        ("002", 0, "2020-05-01 06:40:00", 161, -40, 120, 21070.2, 1389.56, 0, "Lunch", 81.0),
+        ("002", 1, "2020-05-01 11:00:00", 140, -60, 79, 14240.9, -870.7, 0, "Snacks", 64.0),
+        ("002", 2, "2020-05-01 17:40:00", 181, -60, 120, 24096.9, -1080.2, 0, "Breakfast", 91.0),
+        ("002", 3, "2020-05-01 22:40:00", 181, -60, 120, 15926.8, 1870.34, 0, "Breakfast", 21.0),
+        ("002", 4, "2020-05-02 05:20:00", 100, -60, 39, 11686.9, 166.9, 0, "Breakfast", 57.0),
+        ("003", 0, "2020-05-01 06:40:46", 161, -40, 119, 20863.8, 1822.867, 0, "Lunch", 99.0),
+        ("003", 1, "2020-05-01 11:00:31", 139, -59, 78, 14064.6, -475.727, 0, "Lunch", 54.0),
+        ("003", 2, "2020-05-01 17:40:08", 180, -59, 119, 24133.2, -956.4, 0, "Breakfast", 31.0),
+        ("003", 3, "2020-05-01 22:40:03", 180, -60, 118, 15378.1, 1318.9, 0, "Snacks", 39.0),
+        ("003", 4, "2020-05-02 05:20:34", 99, -59, 38, 11560.5, -139.32, 0, "Dinner", 39.0),
+    ],
+    "": [
+        ("001", 0, "2020-05-01 06:40:00", 161, -40, 120, 1442.4, 54.2, 150, "Lunch", 7.0),
+        ("001", 1, "2020-05-01 11:00:00", 140, -60, 79, 1027.5, -78.5, 130, "Lunch", 87.0),
+        ("001", 2, "2020-05-01 17:40:00", 181, -60, 120, 1604.9, -30.7, 169, "Dinner", 49.0),
+        ("001", 3, "2020-05-01 22:40:00", 181, -60, 120, 1061.9, 67.1, 169, "Lunch", 60.0),
+        ("001", 4, "2020-05-02 05:20:00", 100, -60, 39, 703.3, 24.7, 94, "Snacks", 63.0),
+        ("002", 0, "2020-05-01 06:40:00", 161, -40, 120, 4312.4, 279.8, 128, "Lunch", 81.0),
+        ("002", 1, "2020-05-01 11:00:00", 140, -60, 79, 2861.9, -156.5, 112, "Snacks", 64.0),
+        ("002", 2, "2020-05-01 17:40:00", 181, -60, 120, 4920.9, -244.3, 144, "Breakfast", 91.0),
+        ("002", 3, "2020-05-01 22:40:00", 181, -60, 120, 3263.8, 403.7, 144, "Breakfast", 21.0),
+        ("002", 4, "2020-05-02 05:20:00", 100, -60, 39, 2349.3, 55.3, 80, "Breakfast", 57.0),
+        ("003", 0, "2020-05-01 06:40:46", 161, -40, 119, 1411.7, 115.9, 150, "Lunch", 99.0),
+        ("003", 1, "2020-05-01 11:00:31", 139, -58, 79, 898.8, -112.8, 130, "Lunch", 54.0),
+        ("003", 2, "2020-05-01 17:40:08", 180, -59, 119, 1609.8, -60.6, 168, "Breakfast", 31.0),
+        ("003", 3, "2020-05-01 22:40:03", 180, -59, 119, 1023.5, 99.5, 168, "Snacks", 39.0),
+        ("003", 4, "2020-05-02 05:20:34", 99, -59, 38, 703.1, -3.7, 93, "Dinner", 39.0),
+    ],
+}
+
+
+def _summary(frame: pd.DataFrame) -> list:
+    return [
+        (pid, int(meal), str(seg["meal_timestamp"].iloc[0]), len(seg),
+         int(seg["rel_minute"].min()), int(seg["rel_minute"].max()),
+         pytest.approx(float(seg["glucose_mgdl"].sum()), abs=1e-2),
+         pytest.approx(float(seg["delta_glucose_mgdl"].sum()), abs=1e-2),
+         int(seg["glucose_mgdl"].isna().sum()), seg["meal_type"].iloc[0], float(seg["carbs_g"].iloc[0]))
+        for (pid, meal), seg in frame.groupby(["patient_id", "meal_index"], sort=True)
+    ]
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    return _write_dataset(tmp_path / "data")
+
+
+def _listing(path: Path) -> list:
+    return sorted(str(p.relative_to(path)) for p in path.rglob("*"))
+
+
+def test_default_read_leaves_dataset_untouched(dataset):
+    before = _listing(dataset)
+
+    segments.build_meal_segments_from_root(str(dataset.parent), n_jobs=1)
+
+    assert _listing(dataset) == before
+
+
+def test_cache_dir_holds_parquet_and_matches_csv(dataset, tmp_path):
+    pytest.importorskip("pyarrow")
+    cache_dir = tmp_path / "cache"
+    before = _listing(dataset)
+
+    plain = segments.build_meal_segments_from_root(str(dataset.parent), n_jobs=1)
+    first = segments.build_meal_segments_from_root(str(dataset.parent), cache_dir=str(cache_dir), n_jobs=1)
+    cached = segments.build_meal_segments_from_root(str(dataset.parent), cache_dir=str(cache_dir), n_jobs=1)
+
+    assert _listing(dataset) == before
+    assert _listing(cache_dir) == ["CGMacros-001.parquet", "CGMacros-002.parquet", "CGMacros-003.parquet"]
+    pd.testing.assert_frame_equal(first, plain)
+    pd.testing.assert_frame_equal(cached, plain)
+
+
+@pytest.mark.parametrize("rule", ["1min", ""])
+def test_segments_match_original_extraction(dataset, rule):
+    frame = segments.build_meal_segments_from_root(str(dataset.parent), resample_rule=rule, n_jobs=1)
+
+    assert list(frame.columns) == segments._SEGMENT_COLS
+    assert _summary(frame) == EXPECTED[rule]
+
+
+def test_segments_from_csv_reindex_each_patient(dataset):
+    frame = segments.build_meal_segments_from_csv(str(dataset / "CGMacros-002" / "CGMacros-002.csv"))
+
+    assert set(frame["patient_id"]) == {"002"}
+    assert sorted(frame["meal_index"].unique()) == [0, 1, 2, 3, 4]
+    baseline = frame.loc[frame["rel_minute"] == 0, ["glucose_mgdl", "delta_glucose_mgdl"]]
+    assert len(baseline) == 5
+    assert np.isfinite(baseline.to_numpy()).all()
+
+
+def test_missing_root_yields_empty_frame(tmp_path):
+    frame = segments.build_meal_segments_from_root(str(tmp_path))
+
+    assert frame.empty
+    assert list(frame.columns) == segments._SEGMENT_COLS